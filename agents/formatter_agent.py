@@ -104,7 +104,12 @@ class FormatterAgent:
             section += "```\n"
             section += f"**{article['title']}**\n\n"
             section += f"{article['ai_summary']}\n\n"
-            section += f"🔗 **Source:** [{article['source']}]({article['link']})\n"
+            sources = article.get('sources') or []
+            if len(sources) > 1:
+                links = " · ".join(f"[{copy['source']}]({copy['link']})" for copy in sources)
+                section += f"🔗 **Sources:** {links}\n"
+            else:
+                section += f"🔗 **Source:** [{article['source']}]({article['link']})\n"
             section += f"📅 **Date:** {article['published']}\n"
             
             if i < len(articles):
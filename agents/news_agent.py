@@ -1,11 +1,14 @@
 """
 News Research Agent - Fetches and summarizes AI news
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import json
+import asyncio
 from tools.news_scraper import NewsScraper
 from tools.gemini_tool import get_gemini_api
 import config
 from utils.logger import get_logger
+from utils.helpers import run_async
 
 logger = get_logger(__name__)
 
@@ -47,42 +50,65 @@ class NewsAgent:
             # Limit to max articles
             articles = articles[:config.MAX_NEWS_ARTICLES]
             
-            # Summarize each article using Gemini
+            # Copies of the same story from other feeds, folded into these articles
+            duplicates_merged = sum(article.get('duplicates', 0) for article in articles)
+            if duplicates_merged:
+                logger.info(f"{self.name}: {duplicates_merged} duplicate articles merged into these stories")
+            
+            # Give Gemini the article text rather than the feed teaser
+            if config.NEWS_FETCH_ARTICLE_CONTENT:
+                contents = self.news_scraper.fetch_article_contents([a['link'] for a in articles])
+                for article in articles:
+                    if contents.get(article['link']):
+                        article['content'] = contents[article['link']]
+            
+            # Summarize all articles (and the overview) in a single Gemini call
+            summaries: List[Optional[str]] = [None] * len(articles)
+            overall_summary = None
+            if config.NEWS_BATCH_SUMMARIZE:
+                logger.info(f"{self.name}: Batch summarizing {len(articles)} articles")
+                summaries, overall_summary = self._summarize_batch(articles)
+            
+            # Fall back to concurrent per-article calls for anything the batch missed
+            missing = [i for i, summary in enumerate(summaries) if not summary]
+            if missing:
+                logger.info(f"{self.name}: Summarizing {len(missing)} articles individually "
+                            f"(max {self.gemini.max_concurrency} concurrent)")
+                fallback = run_async(self._summarize_articles_async([articles[i] for i in missing]))
+                for i, summary in zip(missing, fallback):
+                    summaries[i] = summary
+            
             summarized_articles = []
-            for i, article in enumerate(articles):
-                logger.info(f"{self.name}: Summarizing article {i+1}/{len(articles)}")
-                
-                # Create prompt for summarization
-                summary = self.gemini.summarize_text(
-                    f"Title: {article['title']}\n\n{article['summary']}",
-                    max_sentences=2
-                )
-                
+            for article, summary in zip(articles, summaries):
                 summarized_article = {
                     'title': article['title'],
                     'link': article['link'],
                     'published': article['published'],
                     'source': article['source'],
+                    'sources': article.get('sources') or [{'source': article['source'], 'link': article['link']}],
                     'original_summary': article['summary'][:200],
                     'ai_summary': summary if summary else article['content_snippet'][:150]
                 }
                 
                 summarized_articles.append(summarized_article)
             
-            # Generate overall summary
-            titles = "\n".join([f"{i+1}. {a['title']}" for i, a in enumerate(summarized_articles)])
-            overall_prompt = f"""Based on these AI news headlines from today, write a brief overview (2-3 sentences) of the main trends and topics:
+            # Generate overall summary (unless the batch call already did)
+            if not overall_summary:
+                titles = "\n".join([f"{i+1}. {a['title']}" for i, a in enumerate(summarized_articles)])
+                overall_prompt = f"""Based on these AI news headlines from today, write a brief overview (2-3 sentences) of the main trends and topics:
 
 {titles}
 
 Overview:"""
-            
-            overall_summary = self.gemini.generate_content(overall_prompt, temperature=0.7)
+                
+                overall_summary = self.gemini.generate_content(overall_prompt, temperature=0.7,
+                                                               caller=f"{self.name}.overview")
             
             result = {
                 'success': True,
                 'articles': summarized_articles,
                 'article_count': len(summarized_articles),
+                'duplicates_merged': duplicates_merged,
                 'overall_summary': overall_summary if overall_summary else "Multiple AI developments and news today.",
                 'agent': self.name
             }
@@ -99,6 +125,78 @@ Overview:"""
                 'agent': self.name
             }
     
+    def _summarize_batch(self, articles: List[Dict[str, Any]]) -> Tuple[List[Optional[str]], Optional[str]]:
+        """
+        Summarize articles with one batched Gemini call
+        
+        Returns:
+            Tuple of (per-article summaries aligned with articles, overview).
+            Entries that could not be parsed are None.
+        """
+        response = self.gemini.summarize_articles_batch(
+            articles, max_sentences=2,
+            validate=lambda response: any(self._parse_batch_summaries(response, len(articles))[0])
+        )
+        
+        if not response:
+            return [None] * len(articles), None
+        
+        summaries, overview = self._parse_batch_summaries(response, len(articles))
+        parsed = sum(1 for summary in summaries if summary)
+        logger.info(f"{self.name}: Batch call returned {parsed}/{len(articles)} summaries")
+        return summaries, overview
+    
+    def _parse_batch_summaries(self, response: str, count: int) -> Tuple[List[Optional[str]], Optional[str]]:
+        """
+        Parse a batch summary reply
+        
+        Returns:
+            Tuple of (summaries aligned with the articles, overview); entries
+            that could not be parsed are None
+        """
+        summaries: List[Optional[str]] = [None] * count
+        try:
+            json_start = response.find('{')
+            json_end = response.rfind('}') + 1
+            
+            if json_start == -1 or json_end == 0:
+                logger.warning(f"{self.name}: No JSON found in batch summary response")
+                return summaries, None
+            
+            data = json.loads(response[json_start:json_end])
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.error(f"{self.name}: Failed to parse batch summary response: {e}")
+            return summaries, None
+        
+        if not isinstance(data, dict):
+            return summaries, None
+        
+        for item in data.get('summaries', []):
+            if not isinstance(item, dict):
+                continue
+            try:
+                idx = int(item.get('index', 0)) - 1  # Convert to 0-based
+            except (TypeError, ValueError):
+                continue
+            summary = item.get('summary')
+            if 0 <= idx < count and isinstance(summary, str) and summary.strip():
+                summaries[idx] = summary.strip()
+        
+        overview = data.get('overview')
+        overview = overview.strip() if isinstance(overview, str) and overview.strip() else None
+        return summaries, overview
+    
+    async def _summarize_articles_async(self, articles: List[Dict[str, Any]]) -> List[Any]:
+        """Summarize articles concurrently, preserving input order"""
+        tasks = [
+            self.gemini.summarize_text_async(
+                f"Title: {article['title']}\n\n{article.get('content') or article['summary']}",
+                max_sentences=2
+            )
+            for article in articles
+        ]
+        return await asyncio.gather(*tasks)
+    
     def get_trending_topics(self, articles: List[Dict[str, Any]]) -> List[str]:
         """Extract trending topics from articles using Gemini"""
         if not articles:
@@ -112,7 +210,7 @@ Return ONLY a comma-separated list of topics:
 
 Topics:"""
         
-        response = self.gemini.generate_content(prompt, temperature=0.3)
+        response = self.gemini.generate_content(prompt, temperature=0.3, caller=f"{self.name}.trending_topics")
         if response:
             topics = [t.strip() for t in response.split(',')]
             return topics[:5]
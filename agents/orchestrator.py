@@ -8,6 +8,8 @@ from agents.paper_discovery_agent import PaperDiscoveryAgent
 from agents.paper_selection_agent import PaperSelectionAgent
 from agents.formatter_agent import FormatterAgent
 from database.models import get_db
+from tools.gemini_metrics import get_gemini_metrics
+from tools.records import records_to_dicts
 import config
 from utils.logger import get_logger
 
@@ -28,6 +30,7 @@ class Orchestrator:
         self.paper_selection_agent = PaperSelectionAgent()
         self.formatter_agent = FormatterAgent()
         self.db = get_db()
+        self.gemini_metrics = get_gemini_metrics()
         
         logger.info(f"{self.name}: Initialized with all agents")
     
@@ -57,6 +60,9 @@ class Orchestrator:
             'errors': []
         }
         
+        # Collect per-run Gemini usage from every agent call made below
+        run_metrics = self.gemini_metrics.start_run()
+        
         try:
             # Step 1: Fetch and analyze news
             logger.info(f"{self.name}: STEP 1/4 - Running News Agent")
@@ -114,7 +120,11 @@ class Orchestrator:
                 selection_data = {'success': False, 'selected_papers': []}
                 logger.warning(f"{self.name}: No papers to select from")
             
-            results['papers_data'] = selection_data
+            # Agents pass compact paper records around; callers get plain dicts
+            results['papers_data'] = {
+                **selection_data,
+                'selected_papers': records_to_dicts(selection_data.get('selected_papers', []))
+            }
             
             # Step 4: Format content
             logger.info(f"{self.name}: STEP 4/4 - Running Formatter Agent")
@@ -170,6 +180,13 @@ class Orchestrator:
             results['success'] = False
             results['errors'].append(f"Critical error: {str(e)}")
             return results
+        
+        finally:
+            gemini_usage = self.gemini_metrics.end_run(run_metrics)
+            results['gemini_metrics'] = gemini_usage
+            logger.info(f"{self.name}: Gemini usage: {gemini_usage['calls']} calls, "
+                        f"{gemini_usage['latency_seconds']:.2f}s total latency, "
+                        f"{gemini_usage['total_tokens']} tokens")
     
     def get_workflow_status(self) -> Dict[str, Any]:
         """Get status of all agents"""
@@ -3,6 +3,7 @@ Paper Discovery Agent - Finds new AI/ML research papers
 """
 from typing import List, Dict, Any
 from tools.arxiv_tool import ArxivTool
+from tools.records import format_authors, records_to_dicts
 import config
 from utils.logger import get_logger
 
@@ -30,12 +31,16 @@ class PaperDiscoveryAgent:
         logger.info(f"{self.name}: Starting paper discovery for last {days_back} days")
         
         try:
-            # Fetch papers from arXiv
-            papers = self.arxiv_tool.get_recent_papers(
+            # Stream paper records from arXiv; authors_short and abstract_short
+            # are derived on access instead of stored per paper. Selection ranks
+            # the whole candidate set in one call, so the stream is collected
+            # here; it ends once MAX_PAPERS_TO_ANALYZE papers have arrived while
+            # the rest of the harvest is stored in the background.
+            papers = list(self.arxiv_tool.stream_recent_papers(
                 days_back=days_back,
                 max_results=config.MAX_PAPERS_TO_ANALYZE,
                 topic=topic
-            )
+            ))
             
             if not papers:
                 logger.warning(f"{self.name}: No papers found")
@@ -47,11 +52,6 @@ class PaperDiscoveryAgent:
             
             logger.info(f"{self.name}: Discovered {len(papers)} papers")
             
-            # Add additional metadata
-            for paper in papers:
-                paper['authors_short'] = self._format_authors(paper['authors'])
-                paper['abstract_short'] = paper['abstract'][:300] + "..."
-            
             result = {
                 'success': True,
                 'papers': papers,
@@ -91,10 +91,7 @@ class PaperDiscoveryAgent:
                 max_results=max_results
             )
             
-            for paper in papers:
-                paper['authors_short'] = self._format_authors(paper['authors'])
-            
-            return papers
+            return records_to_dicts(papers)
             
         except Exception as e:
             logger.error(f"{self.name}: Error searching papers: {e}")
@@ -102,15 +99,7 @@ class PaperDiscoveryAgent:
     
     def _format_authors(self, authors: List[str]) -> str:
         """Format author list for display"""
-        if not authors:
-            return "Unknown"
-        
-        if len(authors) == 1:
-            return authors[0]
-        elif len(authors) == 2:
-            return f"{authors[0]} and {authors[1]}"
-        else:
-            return f"{authors[0]} et al."
+        return format_authors(authors)
     
     def filter_by_categories(self, papers: List[Dict[str, Any]], categories: List[str]) -> List[Dict[str, Any]]:
         """Filter papers by arXiv categories"""
@@ -4,9 +4,11 @@ Paper Selection Agent - Selects and ranks the most important papers
 from typing import List, Dict, Any
 import json
 import random
+import asyncio
 from tools.gemini_tool import get_gemini_api
 import config
 from utils.logger import get_logger
+from utils.helpers import run_async, recover_json_objects, canonical_arxiv_id
 
 logger = get_logger(__name__)
 
@@ -37,7 +39,8 @@ class PaperSelectionAgent:
             from database.models import get_db
             db = get_db()
             original_count = len(papers)
-            papers = [p for p in papers if not db.paper_was_featured(p.get('id'))]
+            featured_ids = db.get_featured_paper_ids()
+            papers = [p for p in papers if canonical_arxiv_id(p.get('id')) not in featured_ids]
             filtered_count = original_count - len(papers)
             if filtered_count > 0:
                 logger.info(f"{self.name}: Filtered out {filtered_count} already featured papers")
@@ -75,13 +78,18 @@ class PaperSelectionAgent:
             else:
                 selection_method = 'ai_ranked'
             
-            # Add categories to papers
+            # Add categories to papers (one batched call, per-paper fallback)
+            categories = self._categorize_batch(selected_papers)
+            missing = [p for p in selected_papers if p.get('id') not in categories]
+            if missing:
+                logger.info(f"{self.name}: Categorizing {len(missing)} papers individually")
+                fallback = run_async(self._categorize_papers_async(missing))
+                for paper, category in zip(missing, fallback):
+                    if category:
+                        categories[paper.get('id')] = category.strip()
+            
             for paper in selected_papers:
-                category = self.gemini.categorize_content(
-                    paper['title'],
-                    paper['abstract'][:500]
-                )
-                paper['category'] = category.strip() if category else 'Other'
+                paper['category'] = categories.get(paper.get('id')) or 'Other'
             
             result = {
                 'success': True,
@@ -113,47 +121,123 @@ class PaperSelectionAgent:
             # Limit papers to analyze to avoid token limits
             papers_to_analyze = papers[:30]
             
-            # Get ranking from Gemini
-            ranking_response = self.gemini.rank_papers(papers_to_analyze)
+            # Get ranking from Gemini (unparseable replies are not cached)
+            ranking_response = self.gemini.rank_papers(
+                papers_to_analyze,
+                validate=lambda response: bool(self._parse_rankings(response))
+            )
             
             if not ranking_response:
                 return []
             
             # Parse JSON response
-            try:
-                # Extract JSON from response (might have extra text)
-                json_start = ranking_response.find('[')
-                json_end = ranking_response.rfind(']') + 1
-                
-                if json_start == -1 or json_end == 0:
-                    logger.warning(f"{self.name}: No JSON found in Gemini response")
-                    return []
-                
-                json_str = ranking_response[json_start:json_end]
-                rankings = json.loads(json_str)
-                
-                # Extract selected papers based on rankings
-                selected = []
-                for rank_item in rankings[:count]:
-                    paper_idx = rank_item.get('paper_index', 0) - 1  # Convert to 0-based
-                    
-                    if 0 <= paper_idx < len(papers_to_analyze):
-                        paper = papers_to_analyze[paper_idx].copy()
-                        paper['rank'] = rank_item.get('rank', 0)
-                        paper['selection_reason'] = rank_item.get('reason', 'Selected by AI')
-                        selected.append(paper)
+            rankings = self._parse_rankings(ranking_response)
+            if not rankings:
+                return []
+            
+            # Extract selected papers based on rankings
+            selected = []
+            seen_indices = set()
+            for rank_item in rankings:
+                try:
+                    paper_idx = int(rank_item.get('paper_index', 0)) - 1  # Convert to 0-based
+                except (TypeError, ValueError):
+                    continue
                 
-                logger.info(f"{self.name}: Successfully ranked {len(selected)} papers with Gemini")
-                return selected
+                if 0 <= paper_idx < len(papers_to_analyze) and paper_idx not in seen_indices:
+                    seen_indices.add(paper_idx)
+                    paper = papers_to_analyze[paper_idx].copy()
+                    paper['rank'] = rank_item.get('rank', len(selected) + 1)
+                    paper['selection_reason'] = rank_item.get('reason', 'Selected by AI')
+                    selected.append(paper)
                 
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
-                logger.error(f"{self.name}: Failed to parse Gemini ranking response: {e}")
-                return []
+                if len(selected) >= count:
+                    break
+            
+            logger.info(f"{self.name}: Successfully ranked {len(selected)} papers with Gemini")
+            return selected
                 
         except Exception as e:
             logger.error(f"{self.name}: Error in Gemini ranking: {e}")
             return []
     
+    def _parse_rankings(self, ranking_response: str) -> List[Dict[str, Any]]:
+        """
+        Parse the ranking JSON array, recovering complete items from partial output
+        
+        Returns:
+            List of ranking dicts (empty if nothing usable was found)
+        """
+        # Extract JSON from response (might have extra text)
+        json_start = ranking_response.find('[')
+        json_end = ranking_response.rfind(']') + 1
+        
+        if json_start != -1 and json_end > json_start:
+            try:
+                rankings = json.loads(ranking_response[json_start:json_end])
+                if isinstance(rankings, list):
+                    return [r for r in rankings if isinstance(r, dict)]
+            except (json.JSONDecodeError, ValueError) as e:
+                logger.warning(f"{self.name}: Ranking response is not valid JSON ({e}), recovering partial items")
+        
+        # Truncated or malformed array: keep every complete ranking object
+        rankings = [
+            r for r in recover_json_objects(ranking_response[max(json_start, 0):])
+            if 'paper_index' in r
+        ]
+        if rankings:
+            logger.info(f"{self.name}: Recovered {len(rankings)} ranking items from partial JSON")
+        else:
+            logger.warning(f"{self.name}: No JSON found in Gemini response")
+        return rankings
+    
+    def _categorize_batch(self, papers: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Categorize papers with one Gemini call, returning categories keyed by arXiv ID"""
+        response = self.gemini.categorize_papers_batch(
+            papers,
+            validate=lambda response: bool(self._parse_categories(response, papers))
+        )
+        
+        if not response:
+            return {}
+        
+        categories = self._parse_categories(response, papers)
+        logger.info(f"{self.name}: Batch categorized {len(categories)}/{len(papers)} papers")
+        return categories
+    
+    def _parse_categories(self, response: str, papers: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Parse a batch categorization reply into categories keyed by known arXiv IDs"""
+        try:
+            json_start = response.find('{')
+            json_end = response.rfind('}') + 1
+            
+            if json_start == -1 or json_end == 0:
+                logger.warning(f"{self.name}: No JSON found in batch categorization response")
+                return {}
+            
+            data = json.loads(response[json_start:json_end])
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.error(f"{self.name}: Failed to parse batch categorization response: {e}")
+            return {}
+        
+        if not isinstance(data, dict):
+            return {}
+        
+        known_ids = {p.get('id') for p in papers}
+        return {
+            str(paper_id): category.strip()
+            for paper_id, category in data.items()
+            if str(paper_id) in known_ids and isinstance(category, str) and category.strip()
+        }
+    
+    async def _categorize_papers_async(self, papers: List[Dict[str, Any]]) -> List[Any]:
+        """Categorize papers concurrently, preserving input order"""
+        tasks = [
+            self.gemini.categorize_content_async(paper['title'], paper['abstract'][:500])
+            for paper in papers
+        ]
+        return await asyncio.gather(*tasks)
+    
     def _random_selection(self, papers: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
         """Randomly select papers (fallback method)"""
         logger.info(f"{self.name}: Using random selection")
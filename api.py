@@ -15,6 +15,7 @@ from apscheduler.triggers.cron import CronTrigger
 from agents.orchestrator import Orchestrator
 from discord_bot.bot import get_bot, set_bot, create_bot
 from discord_bot.sender import set_sender_bot
+from tools.news_poller import get_news_poller
 from database.models import get_db
 import config
 from utils.logger import get_logger, setup_logging
@@ -363,6 +364,9 @@ async def startup_event():
     else:
         logger.warning("Discord token not configured, bot will not start")
     
+    # Collect news in the background so research runs read it locally
+    get_news_poller().start()
+    
     logger.info("API server ready")
     logger.info("="*70)
 
@@ -388,6 +392,9 @@ async def shutdown_event():
         scheduler.shutdown()
         logger.info("Scheduler stopped")
     
+    # Stop news poller
+    get_news_poller().stop()
+    
     # Stop Discord bot
     bot = get_bot()
     if bot:
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark - streaming HTML text extraction vs BeautifulSoup
+
+Compares utils.html_text.html_to_text with the BeautifulSoup code it
+replaced in NewsScraper (feed entry summaries and full article pages),
+and checks that both produce identical text.
+
+Usage:
+    python benchmark_html_cleaner.py [--entries 500] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from bs4 import BeautifulSoup
+
+from utils.html_text import html_to_text
+
+SUMMARY_TEMPLATE = (
+    '<p>Researchers at <a href="https://example.com/lab/{i}">Example Lab</a> released '
+    '<strong>Model-{i}</strong>, a new &ldquo;reasoning&rdquo; model that beats GPT-4 on '
+    '{i} benchmarks &amp; runs on a single GPU.</p>\n'
+    '<p><img src="https://example.com/img/{i}.png" alt="chart" /> The paper&#8217;s authors '
+    'say the approach <em>scales</em> &lt;linearly&gt; with data.</p>'
+    '<p>The post <a href="https://example.com/post/{i}">Model-{i} explained</a> '
+    'appeared first on <a href="https://example.com">AI News</a>.</p>'
+)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Article {i} | AI News</title>
+  <style>body {{ font-family: sans-serif; }} .nav a {{ color: #333; }}</style>
+  <script>window.dataLayer = window.dataLayer || []; function gtag() {{ dataLayer.push(arguments); }}</script>
+</head>
+<body>
+  <nav class="nav"><a href="/">Home</a> | <a href="/ai">AI</a> | <a href="/ml">ML</a></nav>
+  <!-- article body -->
+  <article>
+    <h1>Breakthrough number {i} in machine learning</h1>
+    {paragraphs}
+  </article>
+  <footer>&copy; 2024 AI News &middot; <a href="/privacy">Privacy</a></footer>
+  <script src="/static/app.js"></script>
+</body>
+</html>"""
+
+
+def bs4_clean_summary(html_text: str) -> str:
+    """Previous NewsScraper._clean_html"""
+    soup = BeautifulSoup(html_text, 'html.parser')
+    return soup.get_text(strip=True)
+
+
+def bs4_page_text(html_text: str) -> str:
+    """Previous NewsScraper.get_article_content extraction"""
+    soup = BeautifulSoup(html_text, 'html.parser')
+    for script in soup(['script', 'style']):
+        script.decompose()
+    return soup.get_text()
+
+
+def run(entries: int, repeat: int):
+    summaries = [SUMMARY_TEMPLATE.format(i=i) for i in range(entries)]
+    paragraph = SUMMARY_TEMPLATE.format(i=0)
+    pages = [PAGE_TEMPLATE.format(i=i, paragraphs=paragraph * 20) for i in range(max(1, entries // 10))]
+    
+    cases = [
+        ('feed summaries (strip)', summaries, bs4_clean_summary, lambda h: html_to_text(h, strip=True)),
+        ('article pages', pages, bs4_page_text, html_to_text),
+    ]
+    
+    print("=" * 70)
+    print(f"HTML text extraction benchmark ({entries} summaries, {len(pages)} pages, best of {repeat})")
+    print("=" * 70)
+    
+    for name, docs, baseline, candidate in cases:
+        mismatches = sum(1 for doc in docs if baseline(doc) != candidate(doc))
+        
+        baseline_time = min(timeit.repeat(lambda: [baseline(doc) for doc in docs], number=1, repeat=repeat))
+        candidate_time = min(timeit.repeat(lambda: [candidate(doc) for doc in docs], number=1, repeat=repeat))
+        
+        print(f"{name}:")
+        print(f"  BeautifulSoup : {baseline_time * 1000:8.1f} ms")
+        print(f"  html_to_text  : {candidate_time * 1000:8.1f} ms")
+        print(f"  speedup       : {baseline_time / candidate_time:8.1f}x")
+        print(f"  mismatches    : {mismatches}/{len(docs)}")
+        print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark HTML text extraction')
+    parser.add_argument('--entries', type=int, default=500, help='Number of feed summaries')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+    args = parser.parse_args()
+    run(args.entries, args.repeat)
@@ -11,6 +11,16 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
 GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+GEMINI_POOL_SIZE = int(os.getenv('GEMINI_POOL_SIZE', 10))  # Max keep-alive connections to Gemini
+GEMINI_CONNECT_TIMEOUT = float(os.getenv('GEMINI_CONNECT_TIMEOUT', 10.0))  # TCP/TLS connect timeout (seconds)
+GEMINI_READ_TIMEOUT = float(os.getenv('GEMINI_READ_TIMEOUT', 60.0))  # Response read timeout (seconds)
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 5))  # Max in-flight async requests
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', 60))  # 0 disables the limit
+GEMINI_TOKENS_PER_MINUTE = int(os.getenv('GEMINI_TOKENS_PER_MINUTE', 250000))  # 0 disables the limit
+GEMINI_STRUCTURED_OUTPUT = os.getenv('GEMINI_STRUCTURED_OUTPUT', 'true').lower() == 'true'  # JSON mode for rank_papers
+GEMINI_MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', 4))
+GEMINI_BACKOFF_BASE = float(os.getenv('GEMINI_BACKOFF_BASE', 1.0))  # Seconds
+GEMINI_BACKOFF_MAX = float(os.getenv('GEMINI_BACKOFF_MAX', 30.0))  # Seconds
 
 # Discord Configuration
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
@@ -31,10 +41,20 @@ MAX_NEWS_ARTICLES = int(os.getenv('MAX_NEWS_ARTICLES', 10))
 MAX_PAPERS_TO_ANALYZE = int(os.getenv('MAX_PAPERS_TO_ANALYZE', 100))
 SELECTED_PAPERS_COUNT = int(os.getenv('SELECTED_PAPERS_COUNT', 10))
 DEFAULT_DAYS_BACK = int(os.getenv('DEFAULT_DAYS_BACK', 7))
+NEWS_BATCH_SUMMARIZE = os.getenv('NEWS_BATCH_SUMMARIZE', 'true').lower() == 'true'  # One Gemini call for all articles
 AI_TOPICS = os.getenv('AI_TOPICS', 'LLM,Computer Vision,NLP,Graph Neural Networks,Reinforcement Learning').split(',')
 
 # API Endpoints
 ARXIV_API_URL = "http://export.arxiv.org/api/query"
+ARXIV_MAX_WORKERS = int(os.getenv('ARXIV_MAX_WORKERS', 3))  # Parallel category fetches
+ARXIV_PAGE_SIZE = int(os.getenv('ARXIV_PAGE_SIZE', 100))
+ARXIV_DELAY_SECONDS = float(os.getenv('ARXIV_DELAY_SECONDS', 3.0))  # Politeness delay between pages per connection
+ARXIV_QUERY_BUDGET = int(os.getenv('ARXIV_QUERY_BUDGET', 500))  # Max results per query before splitting by date
+ARXIV_INCREMENTAL = os.getenv('ARXIV_INCREMENTAL', 'true').lower() == 'true'  # Delta fetch using stored high-water marks
+ARXIV_CORPUS_MAX_AGE_MINUTES = int(os.getenv('ARXIV_CORPUS_MAX_AGE_MINUTES', 60))  # Serve from local corpus without querying arXiv
+ARXIV_SEARCH_CACHE_TTL_MINUTES = int(os.getenv('ARXIV_SEARCH_CACHE_TTL_MINUTES', 30))  # Topic search results served from memory
+ARXIV_SEARCH_CACHE_STALE_MINUTES = int(os.getenv('ARXIV_SEARCH_CACHE_STALE_MINUTES', 30))  # Extra window served stale while refreshing
+ARXIV_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('ARXIV_SEARCH_CACHE_MAX_ENTRIES', 256))
 SEMANTIC_SCHOLAR_API_URL = "https://api.semanticscholar.org/graph/v1"
 
 # News Sources
@@ -44,10 +64,31 @@ NEWS_SOURCES = [
     "https://openai.com/blog/rss/",
     "https://blog.google/technology/ai/rss/",
 ]
+NEWS_MAX_WORKERS = int(os.getenv('NEWS_MAX_WORKERS', 8))  # Feeds downloaded in parallel
+NEWS_FEED_TIMEOUT = float(os.getenv('NEWS_FEED_TIMEOUT', 10.0))  # Seconds allowed per feed download
+NEWS_FETCH_DEADLINE = float(os.getenv('NEWS_FETCH_DEADLINE', 20.0))  # Seconds allowed for all feeds together
+NEWS_FEED_CACHE_ENABLED = os.getenv('NEWS_FEED_CACHE_ENABLED', 'true').lower() == 'true'  # Conditional GET with stored entries
+NEWS_FETCH_ARTICLE_CONTENT = os.getenv('NEWS_FETCH_ARTICLE_CONTENT', 'true').lower() == 'true'  # Summarize full article text
+NEWS_ARTICLE_MAX_CHARS = int(os.getenv('NEWS_ARTICLE_MAX_CHARS', 2000))  # Text kept per article
+NEWS_ARTICLE_MAX_BYTES = int(os.getenv('NEWS_ARTICLE_MAX_BYTES', 512 * 1024))  # Stop reading pages after this many bytes
+NEWS_ARTICLE_CACHE_TTL_HOURS = int(os.getenv('NEWS_ARTICLE_CACHE_TTL_HOURS', 24))
+NEWS_ARTICLE_CACHE_MAX_ENTRIES = int(os.getenv('NEWS_ARTICLE_CACHE_MAX_ENTRIES', 500))
+NEWS_DEDUP_ENABLED = os.getenv('NEWS_DEDUP_ENABLED', 'true').lower() == 'true'  # Merge the same story from several feeds
+NEWS_DUPLICATE_THRESHOLD = float(os.getenv('NEWS_DUPLICATE_THRESHOLD', 0.6))  # Min title+snippet word similarity
+NEWS_POLLER_ENABLED = os.getenv('NEWS_POLLER_ENABLED', 'true').lower() == 'true'  # Prefetch feeds in the background
+NEWS_POLL_MIN_MINUTES = int(os.getenv('NEWS_POLL_MIN_MINUTES', 10))  # Fastest per-feed polling interval
+NEWS_POLL_MAX_MINUTES = int(os.getenv('NEWS_POLL_MAX_MINUTES', 120))  # Slowest per-feed polling interval
+NEWS_STORE_RETENTION_DAYS = int(os.getenv('NEWS_STORE_RETENTION_DAYS', 7))  # Keep polled entries this long
 
 # Database
 DATABASE_PATH = "data/research_bot.db"
 
+# Gemini response cache (stored next to the main database)
+GEMINI_CACHE_ENABLED = os.getenv('GEMINI_CACHE_ENABLED', 'true').lower() == 'true'
+GEMINI_CACHE_PATH = "data/gemini_cache.db"
+GEMINI_CACHE_TTL_HOURS = int(os.getenv('GEMINI_CACHE_TTL_HOURS', 24 * 7))
+GEMINI_CACHE_MAX_ENTRIES = int(os.getenv('GEMINI_CACHE_MAX_ENTRIES', 5000))
+
 # Logging
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 LOG_FILE = "logs/bot.log"
@@ -6,7 +6,13 @@ from .models import (
     get_db,
     ResearchRun,
     Paper,
-    NewsArticle
+    NewsArticle,
+    ArxivPaper,
+    ArxivHarvestState,
+    FeedCacheEntry,
+    NewsEntry,
+    FeedSchedule,
+    PollerLease
 )
 
 __all__ = [
@@ -14,5 +20,11 @@ __all__ = [
     'get_db',
     'ResearchRun',
     'Paper',
-    'NewsArticle'
+    'NewsArticle',
+    'ArxivPaper',
+    'ArxivHarvestState',
+    'FeedCacheEntry',
+    'NewsEntry',
+    'FeedSchedule',
+    'PollerLease'
 ]
@@ -1,12 +1,18 @@
 """
 Database models for storing research history
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import create_engine, event, Column, Integer, Float, String, DateTime, Text, Boolean, UniqueConstraint, and_, or_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from sqlalchemy.orm import Session as SessionType, sessionmaker
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional
+import json
+import threading
 import config
 import os
+from utils.helpers import canonical_arxiv_id, split_arxiv_id
 
 Base = declarative_base()
 
@@ -55,6 +61,122 @@ class NewsArticle(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
+class ArxivPaper(Base):
+    """Model for locally stored arXiv paper metadata"""
+    __tablename__ = 'arxiv_papers'
+    
+    id = Column(Integer, primary_key=True)
+    paper_id = Column(String(50), unique=True, index=True)  # Version-agnostic arXiv ID
+    title = Column(Text)
+    authors = Column(Text)  # JSON list
+    abstract = Column(Text)
+    published_date = Column(DateTime, index=True)  # Full submission timestamp (UTC)
+    updated_date = Column(DateTime)
+    categories = Column(Text)  # Space separated, padded: " cs.AI cs.LG "
+    primary_category = Column(String(20))
+    pdf_url = Column(String(500))
+    links = Column(Text)  # JSON list
+    version = Column(Integer, default=1)
+    created_at = Column(DateTime, default=datetime.now)
+    
+    def to_dict(self) -> dict:
+        """Convert to the paper dictionary format used by the agents"""
+        return {
+            'id': f"{self.paper_id}v{self.version}" if self.version else self.paper_id,
+            'title': self.title,
+            'authors': json.loads(self.authors) if self.authors else [],
+            'abstract': self.abstract,
+            'published': self.published_date.strftime('%Y-%m-%d'),
+            'updated': self.updated_date.strftime('%Y-%m-%d') if self.updated_date else None,
+            'submitted': self.published_date.isoformat(),
+            'categories': self.categories.split() if self.categories else [],
+            'primary_category': self.primary_category,
+            'pdf_url': self.pdf_url,
+            'links': json.loads(self.links) if self.links else [],
+            'version': self.version or 1,
+            'source': 'arxiv'
+        }
+
+
+class ArxivHarvestState(Base):
+    """Model for per-category arXiv harvesting progress"""
+    __tablename__ = 'arxiv_harvest_state'
+    
+    id = Column(Integer, primary_key=True)
+    category = Column(String(20), unique=True, index=True)
+    high_water_mark = Column(DateTime)  # Newest submission timestamp seen (UTC)
+    covered_since = Column(DateTime)  # Everything from here (UTC) to the mark is stored locally
+    last_harvested = Column(DateTime)  # UTC
+
+
+class FeedCacheEntry(Base):
+    """Model for conditional-GET validators and parsed entries of an RSS feed"""
+    __tablename__ = 'feed_cache'
+    
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), unique=True, index=True)
+    etag = Column(String(200))
+    last_modified = Column(String(100))
+    source = Column(String(200))
+    entries = Column(Text)  # JSON list of normalized entries, in feed order
+    fetched_at = Column(Float)  # Unix time of the last download or revalidation
+    hits = Column(Integer, default=0)  # 304 Not Modified answers
+    misses = Column(Integer, default=0)  # Full downloads
+    skipped = Column(Integer, default=0)  # Already-seen entries not parsed again
+
+
+class NewsEntry(Base):
+    """Model for news feed entries collected by the background poller"""
+    __tablename__ = 'news_entries'
+    __table_args__ = (UniqueConstraint('feed_url', 'link'),)
+    
+    id = Column(Integer, primary_key=True)
+    feed_url = Column(String(500), nullable=False)
+    link = Column(String(500), nullable=False)  # Title when the entry has no link
+    source = Column(String(200))
+    title = Column(Text)
+    summary = Column(Text)
+    published_date = Column(DateTime)
+    content_snippet = Column(Text)
+    first_seen = Column(Float, index=True)  # Unix time the poller stored the entry
+    
+    def to_dict(self) -> dict:
+        """Convert to the feed entry format used by the news scraper"""
+        return {
+            'source': self.source,
+            'title': self.title,
+            'link': self.link,
+            'summary': self.summary,
+            'published': self.published_date.isoformat() if self.published_date else None,
+            'content_snippet': self.content_snippet
+        }
+
+
+class FeedSchedule(Base):
+    """Model for a news feed's adaptive polling schedule"""
+    __tablename__ = 'feed_schedule'
+    
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), unique=True, index=True)
+    interval = Column(Float)  # Seconds between polls
+    next_poll = Column(Float)  # Unix time
+    last_success = Column(Float)  # Unix time
+    last_new_entry = Column(Float)  # Unix time
+    polls = Column(Integer, default=0)
+    new_entries = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+
+
+class PollerLease(Base):
+    """Model for a lease letting one process at a time run a background job"""
+    __tablename__ = 'poller_lease'
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), unique=True, index=True)
+    owner = Column(String(200))  # host:pid:nonce of the holder
+    expires_at = Column(Float)  # Unix time
+
+
 class DatabaseManager:
     """Manager for database operations"""
     
@@ -67,13 +189,31 @@ class DatabaseManager:
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
         
-        # Create engine
+        # Create engine; WAL lets background writers (feed poller, arXiv
+        # harvest) commit while other connections read
         self.engine = create_engine(f'sqlite:///{db_path}')
+        event.listen(self.engine, 'connect', _enable_wal)
         Base.metadata.create_all(self.engine)
         
         # Create session
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[SessionType]:
+        """
+        Session for one unit of work, committed on success and rolled back on error
+        
+        Units of work are serialized, so one manager can be shared between threads.
+        """
+        with self._lock:
+            try:
+                yield self.session
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
     
     def add_research_run(self, success: bool, news_count: int, papers_count: int, 
                         execution_time: int, errors: str = None) -> ResearchRun:
@@ -91,9 +231,9 @@ class DatabaseManager:
     
     def add_paper(self, paper_data: dict, featured: bool = False) -> Paper:
         """Add or update a paper record"""
-        # Check if paper already exists
-        existing = self.session.query(Paper).filter_by(
-            paper_id=paper_data.get('id')
+        # Check if paper already exists (under any version)
+        existing = self.session.query(Paper).filter(
+            _paper_id_matches(paper_data.get('id'))
         ).first()
         
         if existing:
@@ -161,22 +301,154 @@ class DatabaseManager:
         Args:
             paper_id: arXiv paper ID
             days: Number of days to look back (default: 30)
-            
+        
         Returns:
             True if paper was featured in the last N days
         """
         from datetime import timedelta
         cutoff = datetime.now() - timedelta(days=days)
         
-        paper = self.session.query(Paper).filter_by(
-            paper_id=paper_id
+        paper = self.session.query(Paper).filter(
+            _paper_id_matches(paper_id),
+            Paper.featured_date >= cutoff
         ).first()
         
-        return paper is not None and paper.featured_date is not None and paper.featured_date >= cutoff
+        return paper is not None
+    
+    def get_featured_paper_ids(self, days: int = 30) -> set:
+        """
+        Get version-agnostic IDs of papers featured in the last N days
+        
+        Args:
+            days: Number of days to look back (default: 30)
+        
+        Returns:
+            Set of canonical arXiv IDs
+        """
+        cutoff = datetime.now() - timedelta(days=days)
+        rows = self.session.query(Paper.paper_id).filter(Paper.featured_date >= cutoff).all()
+        return {canonical_arxiv_id(paper_id) for (paper_id,) in rows}
+    
+    def get_harvest_state(self, category: str) -> Optional[ArxivHarvestState]:
+        """Get harvesting progress for an arXiv category"""
+        return self.session.query(ArxivHarvestState).filter_by(category=category).first()
+    
+    def update_harvest_state(self, category: str, high_water_mark: Optional[datetime],
+                             covered_since: Optional[datetime]) -> ArxivHarvestState:
+        """Create or update harvesting progress for an arXiv category"""
+        state = self.get_harvest_state(category)
+        if state is None:
+            state = ArxivHarvestState(category=category)
+            self.session.add(state)
+        
+        state.high_water_mark = high_water_mark
+        state.covered_since = covered_since
+        state.last_harvested = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.session.commit()
+        return state
+    
+    def add_arxiv_papers(self, papers: List[dict]) -> int:
+        """
+        Bulk upsert arXiv paper metadata into the local corpus
+        
+        Args:
+            papers: List of paper dictionaries from ArxivTool
+        
+        Returns:
+            Number of newly stored papers
+        """
+        if not papers:
+            return 0
+        
+        rows = []
+        for paper_data in papers:
+            base_id, version = split_arxiv_id(paper_data['id'])
+            rows.append({
+                'paper_id': base_id,
+                'title': paper_data.get('title'),
+                'authors': json.dumps(paper_data.get('authors', [])),
+                'abstract': paper_data.get('abstract'),
+                'published_date': _submitted_date(paper_data),
+                'updated_date': datetime.strptime(paper_data['updated'], '%Y-%m-%d') if paper_data.get('updated') else None,
+                'categories': f" {' '.join(paper_data.get('categories', []))} ",
+                'primary_category': paper_data.get('primary_category'),
+                'pdf_url': paper_data.get('pdf_url'),
+                'links': json.dumps(paper_data.get('links', [])),
+                'version': version or 1,
+                'created_at': datetime.now(),
+            })
+        
+        stmt = sqlite_insert(ArxivPaper.__table__)
+        # One row per paper: a newer version replaces the stored one, an
+        # older one never overwrites it
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['paper_id'],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0].keys()
+                if column not in ('paper_id', 'created_at')
+            },
+            where=stmt.excluded.version >= func.coalesce(ArxivPaper.version, 1)
+        )
+        
+        before = self.session.query(func.count(ArxivPaper.id)).scalar()
+        self.session.execute(stmt, rows)
+        self.session.commit()
+        after = self.session.query(func.count(ArxivPaper.id)).scalar()
+        return after - before
+    
+    def iter_arxiv_papers(self, categories: List[str], since: datetime, limit: int = None,
+                          keywords: List[str] = None) -> Iterator[dict]:
+        """
+        Stream locally stored arXiv papers in any of the categories, newest first
+        
+        Filtering, ordering and the limit run in SQL and rows are fetched in
+        batches, so only the papers returned are ever loaded.
+        
+        Args:
+            categories: arXiv categories to match (cross-lists included)
+            since: Only papers submitted at or after this time (naive UTC)
+            limit: Maximum number of papers to return
+            keywords: Only papers whose title or abstract contains one of these phrases
+        
+        Yields:
+            Paper dictionaries
+        """
+        query = self.session.query(ArxivPaper).filter(
+            ArxivPaper.published_date >= since,
+            or_(*[ArxivPaper.categories.like(f"% {category} %") for category in categories])
+        )
+        
+        if keywords:
+            text = func.coalesce(ArxivPaper.title, '') + ' ' + func.coalesce(ArxivPaper.abstract, '')
+            query = query.filter(or_(*[text.icontains(keyword, autoescape=True) for keyword in keywords]))
+        
+        query = query.order_by(ArxivPaper.published_date.desc(), ArxivPaper.paper_id.desc())
+        if limit:
+            query = query.limit(limit)
+        
+        for row in query.yield_per(200):
+            yield row.to_dict()
+    
+    def arxiv_corpus_is_fresh(self, categories: List[str], since: datetime, max_age_minutes: int) -> bool:
+        """
+        Check whether the local corpus can answer a window without querying arXiv
+        
+        Every category must have been harvested within max_age_minutes and
+        be fully stored back to `since` (naive UTC, like the harvest marks).
+        """
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=max_age_minutes)
+        for category in categories:
+            state = self.get_harvest_state(category)
+            if (state is None or state.last_harvested is None or state.covered_since is None
+                    or state.last_harvested < cutoff or state.covered_since > since):
+                return False
+        return True
     
     def get_statistics(self) -> dict:
         """Get database statistics"""
         return {
+            'arxiv_corpus_papers': self.session.query(ArxivPaper).count(),
             'total_runs': self.session.query(ResearchRun).count(),
             'successful_runs': self.session.query(ResearchRun).filter_by(success=True).count(),
             'total_papers': self.session.query(Paper).count(),
@@ -190,6 +462,28 @@ class DatabaseManager:
         self.session.close()
 
 
+def _enable_wal(dbapi_connection, connection_record):
+    """Switch a new SQLite connection to write-ahead logging"""
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+
+def _paper_id_matches(paper_id: str):
+    """Filter matching any stored version of an arXiv ID in the papers table"""
+    base_id = canonical_arxiv_id(paper_id)
+    # Range instead of LIKE so the paper_id index is used: base, basev1, basev2, ...
+    return or_(
+        Paper.paper_id == base_id,
+        and_(Paper.paper_id > f"{base_id}v", Paper.paper_id < f"{base_id}w")
+    )
+
+
+def _submitted_date(paper_data: dict) -> datetime:
+    """Submission timestamp of a paper dictionary, falling back to its publish date"""
+    if paper_data.get('submitted'):
+        return datetime.fromisoformat(paper_data['submitted'])
+    return datetime.strptime(paper_data.get('published', '2000-01-01'), '%Y-%m-%d')
+
+
 def get_db() -> DatabaseManager:
     """Get database manager instance"""
     return DatabaseManager()
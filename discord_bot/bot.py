@@ -46,6 +46,10 @@ class ResearchBot(commands.Bot):
         # Load commands
         await self.load_extension('discord_bot.commands')
         
+        # Collect news between commands so !research reads it locally
+        from tools.news_poller import get_news_poller
+        get_news_poller().start()
+        
         logger.info(f"{self.name}: Bot setup complete")
     
     async def on_ready(self):
@@ -7,6 +7,7 @@ from datetime import datetime
 import pytz
 import config
 from agents.orchestrator import Orchestrator
+from tools.news_poller import get_news_poller
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -114,6 +115,9 @@ class DailyScheduler:
         logger.info(f"Next run time: {self.scheduler.get_jobs()[0].next_run_time if self.scheduler.get_jobs() else 'No jobs scheduled'}")
         logger.info("="*70)
         
+        # Collect news between runs so the daily job reads it locally
+        get_news_poller().start()
+        
         try:
             self.scheduler.start()
         except (KeyboardInterrupt, SystemExit):
@@ -138,6 +142,7 @@ class DailyScheduler:
         """Stop the scheduler"""
         logger.info(f"{self.name}: Stopping scheduler")
         self.scheduler.shutdown()
+        get_news_poller().stop()
 
 
 def create_scheduler() -> DailyScheduler:
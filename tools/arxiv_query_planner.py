@@ -0,0 +1,114 @@
+"""
+Query planner for arXiv searches
+"""
+from datetime import datetime, timezone
+from typing import List, Dict, Tuple
+import config
+
+# arXiv categories for AI/ML
+DEFAULT_CATEGORIES = [
+    'cs.AI',  # Artificial Intelligence
+    'cs.LG',  # Machine Learning
+    'cs.CL',  # Computation and Language (NLP)
+    'cs.CV',  # Computer Vision
+    'cs.NE',  # Neural and Evolutionary Computing
+    'stat.ML',  # Machine Learning (stats)
+]
+
+# Topic to (categories, keyword phrases) mapping
+TOPIC_QUERIES = {
+    'nlp': (['cs.CL'], []),
+    'llm': (['cs.CL', 'cs.AI'], ['large language model', 'LLM', 'language model']),
+    'cv': (['cs.CV'], []),
+    'computer vision': (['cs.CV'], []),
+    'graph': (['cs.LG', 'cs.AI'], ['graph']),
+    'gnn': (['cs.LG'], ['graph neural network', 'GNN']),
+    'rl': (['cs.LG', 'cs.AI'], ['reinforcement learning']),
+    'reinforcement learning': (['cs.LG', 'cs.AI'], ['reinforcement learning']),
+}
+
+# Fallback for unknown topics
+DEFAULT_TOPIC_CATEGORIES = ['cs.AI', 'cs.LG']
+
+
+def _arxiv_timestamp(value: datetime) -> str:
+    """Format a naive UTC datetime as an arXiv submittedDate bound (GMT)"""
+    return value.replace(tzinfo=timezone.utc).strftime('%Y%m%d%H%M')
+
+
+class ArxivQuery:
+    """One OR-ed category query over a submission date range"""
+    
+    def __init__(self, categories: List[str], start: datetime, end: datetime, keywords: List[str] = None):
+        self.categories = list(categories)
+        self.start = start
+        self.end = end
+        self.keywords = list(keywords or [])
+    
+    def to_search_query(self) -> str:
+        """Build the arXiv API search_query string"""
+        clauses = [
+            "(" + " OR ".join(f"cat:{category}" for category in self.categories) + ")",
+            f"submittedDate:[{_arxiv_timestamp(self.start)} TO {_arxiv_timestamp(self.end)}]",
+        ]
+        
+        if self.keywords:
+            terms = []
+            for keyword in self.keywords:
+                phrase = f'"{keyword}"' if ' ' in keyword else keyword
+                terms.append(f"ti:{phrase} OR abs:{phrase}")
+            clauses.append("(" + " OR ".join(terms) + ")")
+        
+        return " AND ".join(clauses)
+    
+    def narrowed(self, end: datetime) -> 'ArxivQuery':
+        """Same query restricted to papers submitted up to `end`"""
+        return ArxivQuery(self.categories, self.start, end, self.keywords)
+    
+    def __repr__(self) -> str:
+        return f"ArxivQuery({self.to_search_query()!r})"
+
+
+class ArxivQueryPlanner:
+    """Plans the fewest arXiv queries needed to cover a window"""
+    
+    def __init__(self, page_budget: int = None):
+        self.page_budget = page_budget or config.ARXIV_QUERY_BUDGET
+    
+    def resolve_topic(self, topic: str = None) -> Tuple[List[str], List[str]]:
+        """
+        Map an optional topic to arXiv categories and keyword phrases
+        
+        Returns:
+            Tuple of (categories, keywords)
+        """
+        if not topic:
+            return list(DEFAULT_CATEGORIES), []
+        
+        categories, keywords = TOPIC_QUERIES.get(topic.lower(), (DEFAULT_TOPIC_CATEGORIES, []))
+        return list(categories), list(keywords)
+    
+    def plan(self, fetch_since: Dict[str, datetime], end: datetime, keywords: List[str] = None) -> List[ArxivQuery]:
+        """
+        Build one combined query per distinct start date
+        
+        Categories that need the same window (normally all of them) share a
+        single OR-ed query; categories with different high-water marks get
+        their own.
+        
+        Args:
+            fetch_since: Category -> earliest submission date to fetch
+            end: Upper bound of the window
+            keywords: Optional keyword phrases restricting title/abstract
+        
+        Returns:
+            List of queries
+        """
+        groups: Dict[datetime, List[str]] = {}
+        for category, since in fetch_since.items():
+            groups.setdefault(since, []).append(category)
+        
+        return [
+            ArxivQuery(categories, since, end, keywords)
+            for since, categories in sorted(groups.items())
+        ]
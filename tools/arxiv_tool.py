@@ -2,21 +2,254 @@
 arXiv API Tool for fetching AI/ML papers
 """
 import arxiv
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import heapq
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Iterator, Callable
 import config
+from database.models import get_db
+from tools.arxiv_query_planner import ArxivQuery, ArxivQueryPlanner
+from tools.records import PaperRecord
 from utils.logger import get_logger
+from utils.ttl_cache import TTLCache
 
 logger = get_logger(__name__)
 
+# Search results shared by all ArxivTool instances
+_search_cache = TTLCache(
+    ttl=config.ARXIV_SEARCH_CACHE_TTL_MINUTES * 60,
+    max_entries=config.ARXIV_SEARCH_CACHE_MAX_ENTRIES,
+    stale_ttl=config.ARXIV_SEARCH_CACHE_STALE_MINUTES * 60
+)
+
+
+def _submitted_utc(result: arxiv.Result) -> datetime:
+    """Submission time of a result as a naive UTC datetime (the unit of windows and marks)"""
+    return result.published.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a free-text search query for use as a cache key"""
+    return ' '.join(query.lower().split())
+
 
 class ArxivTool:
     """Tool for searching and fetching papers from arXiv"""
     
     def __init__(self):
-        self.client = arxiv.Client()
+        self.client = self._create_client()
+        self.max_workers = config.ARXIV_MAX_WORKERS
+        self.planner = ArxivQueryPlanner()
+    
+    def _create_client(self, page_size: int = None, delay_seconds: float = None) -> arxiv.Client:
+        """Create an arXiv client; each client enforces its own politeness delay"""
+        return arxiv.Client(
+            page_size=page_size or config.ARXIV_PAGE_SIZE,
+            delay_seconds=config.ARXIV_DELAY_SECONDS if delay_seconds is None else delay_seconds,
+            num_retries=3
+        )
+    
+    def _result_to_paper(self, result: arxiv.Result) -> PaperRecord:
+        """Convert arXiv result to a paper record"""
+        return PaperRecord(
+            id=result.entry_id.split('/')[-1],
+            title=result.title,
+            authors=[author.name for author in result.authors],
+            abstract=result.summary,
+            published=result.published.strftime('%Y-%m-%d'),
+            updated=result.updated.strftime('%Y-%m-%d'),
+            categories=result.categories,
+            primary_category=result.primary_category,
+            pdf_url=result.pdf_url,
+            links=[link.href for link in result.links],
+            source='arxiv',
+            submitted=_submitted_utc(result).isoformat()
+        )
+    
+    def _iter_results(self, query: str, since: Optional[datetime] = None, max_results: Optional[int] = None,
+                      page_size: int = None, delay_seconds: float = None) -> Iterator[arxiv.Result]:
+        """
+        Page through submitted-date-descending results, stopping at the cutoff
+        
+        Pages are requested lazily, so no page past the first result older
+        than `since` (naive UTC) is ever downloaded.
+        """
+        client = self._create_client(page_size, delay_seconds)
+        search = arxiv.Search(
+            query=query,
+            max_results=max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+        
+        for result in client.results(search):
+            if since is not None and _submitted_utc(result) < since:
+                return
+            yield result
+    
+    def iter_papers(self, query: str, since: Optional[datetime] = None, max_results: Optional[int] = None,
+                    page_size: int = None, delay_seconds: float = None) -> Iterator[PaperRecord]:
+        """
+        Stream papers for a query, newest first, as each page arrives
+        
+        Args:
+            query: arXiv search query (e.g. "cat:cs.AI")
+            since: Stop as soon as a paper submitted before this (naive UTC) is reached
+            max_results: Maximum number of results to request
+            page_size: Results per API page (default: ARXIV_PAGE_SIZE)
+            delay_seconds: Delay between page requests (default: ARXIV_DELAY_SECONDS)
+        
+        Yields:
+            Paper records
+        """
+        for result in self._iter_results(query, since, max_results, page_size, delay_seconds):
+            yield self._result_to_paper(result)
+    
+    def _fetch_query(self, query: ArxivQuery, max_results: Optional[int],
+                     on_paper: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     stop: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Fetch papers for a planned query, splitting it only when it overflows
+        
+        Each request asks for at most the planner's page budget. When a
+        segment comes back full, the rest of the date range is requested as a
+        new, narrower query ending at the oldest paper seen, instead of paging
+        ever deeper into one huge result set.
+        
+        Runs on a worker thread with its own client, so concurrent queries
+        each keep arXiv's delay between their own page requests.
+        
+        Args:
+            max_results: Stop after this many papers; None fetches the whole window
+            on_paper: Called with each paper as soon as it is parsed
+            stop: Abandon the fetch early when this event is set
+        
+        Returns:
+            Dictionary with papers, newest/oldest submission timestamps seen
+            and whether the cutoff was reached (window fully covered)
+        """
+        papers = []
+        seen_ids = set()
+        newest = None
+        oldest = None
+        reached_cutoff = False
+        segment = query
+        requests_made = 0
+        
+        while (max_results is None or len(papers) < max_results) and (stop is None or not stop.is_set()):
+            budget = self.planner.page_budget
+            if max_results is not None:
+                budget = min(max_results - len(papers), budget)
+            results = self._iter_results(segment.to_search_query(), query.start, budget)
+            requests_made += 1
+            count = 0
+            
+            while stop is None or not stop.is_set():
+                try:
+                    result = next(results)
+                except StopIteration:
+                    break
+                
+                count += 1
+                paper = self._result_to_paper(result)
+                if paper.base_id in seen_ids:  # Overlap at a segment boundary
+                    continue
+                seen_ids.add(paper.base_id)
+                
+                published = _submitted_utc(result)
+                newest = max(newest, published) if newest else published
+                oldest = min(oldest, published) if oldest else published
+                
+                papers.append(paper)
+                if on_paper:
+                    on_paper(paper)
+            
+            if count < budget:
+                # Ran past the cutoff or out of results: the window is covered
+                reached_cutoff = stop is None or not stop.is_set()
+                break
+            
+            # Segment was full: split off the older remainder of the window
+            if oldest is None or oldest >= segment.end:
+                break
+            segment = segment.narrowed(end=oldest)
+            logger.info(f"Query hit page budget ({budget}), splitting at {oldest}")
+        
+        logger.info(f"Fetched {len(papers)} papers in {requests_made} queries for {query.categories}")
+        return {
+            'papers': papers,
+            'newest': newest,
+            'oldest': oldest,
+            'reached_cutoff': reached_cutoff
+        }
+    
+    def _harvest_plan(self, db, category: str, start_date: datetime) -> Optional[datetime]:
+        """
+        Decide where to start fetching a category
+        
+        Returns:
+            The high-water mark if the local corpus already covers the window
+            up to it (delta fetch), otherwise None (fetch the full window)
+        """
+        if not config.ARXIV_INCREMENTAL:
+            return None
+        
+        state = db.get_harvest_state(category)
+        if state is None or state.high_water_mark is None or state.covered_since is None:
+            return None
+        if state.covered_since > start_date:
+            return None
+        return state.high_water_mark
+    
+    def _record_harvest(self, db, categories: List[str], fetch: Dict[str, Any],
+                        fetch_since: Dict[str, datetime], marks: Dict[str, Optional[datetime]]):
+        """Persist fetched papers and advance each category's high-water mark"""
+        added = db.add_arxiv_papers(fetch['papers'])
+        logger.info(f"Stored {added} new papers for {categories} in local arXiv corpus")
+        
+        for category in categories:
+            since = fetch_since[category]
+            mark = marks[category]
+            
+            state = db.get_harvest_state(category)
+            previous_mark = state.high_water_mark if state else None
+            previous_since = state.covered_since if state else None
+            
+            # If the fetch stopped before reaching the cutoff, only the span of
+            # papers actually returned is known to be complete
+            covered_from = since if fetch['reached_cutoff'] else (fetch['oldest'] or since)
+            
+            if mark is not None and fetch['reached_cutoff'] and previous_since is not None:
+                # Delta joined up with the previously covered span
+                covered_since = min(previous_since, covered_from)
+            else:
+                covered_since = covered_from
+            
+            candidates = [m for m in (previous_mark, fetch['newest']) if m is not None]
+            high_water_mark = max(candidates) if candidates else None
+            db.update_harvest_state(category, high_water_mark, covered_since)
     
-    def get_recent_papers(self, days_back: int = 7, max_results: int = 100, topic: str = None) -> List[Dict[str, Any]]:
+    def _store_fetch(self, query: ArxivQuery, fetch: Dict[str, Any], track_harvest: bool,
+                     fetch_since: Dict[str, datetime], marks: Dict[str, Optional[datetime]]):
+        """Save a finished fetch to the local corpus on the worker's own connection"""
+        if not config.ARXIV_INCREMENTAL:
+            return
+        
+        db = get_db()
+        try:
+            if track_harvest:
+                self._record_harvest(db, query.categories, fetch, fetch_since, marks)
+            else:
+                db.add_arxiv_papers(fetch['papers'])
+        except Exception as e:
+            logger.warning(f"Could not store harvest for {query.categories}: {e}")
+            db.session.rollback()
+        finally:
+            db.close()
+    
+    def get_recent_papers(self, days_back: int = 7, max_results: int = 100, topic: str = None) -> List[PaperRecord]:
         """
         Fetch recent AI/ML papers from arXiv
         
@@ -24,132 +257,189 @@ class ArxivTool:
             days_back: Number of days to look back (default: 7)
             max_results: Maximum number of papers to fetch
             topic: Optional topic filter (NLP, LLM, CV, Graph, etc.)
-            
+        
         Returns:
-            List of paper dictionaries
+            List of paper records
         """
-        papers = []
+        papers_list = list(self.stream_recent_papers(days_back, max_results, topic))
+        logger.info(f"Total unique papers fetched: {len(papers_list)}")
+        return papers_list
+    
+    def stream_recent_papers(self, days_back: int = 7, max_results: int = 100,
+                             topic: str = None) -> Iterator[PaperRecord]:
+        """
+        Stream the newest AI/ML papers of a window, newest first, without duplicates
         
-        # Topic to category mapping
-        topic_map = {
-            'nlp': ['cs.CL'],
-            'llm': ['cs.CL', 'cs.AI'],
-            'cv': ['cs.CV'],
-            'computer vision': ['cs.CV'],
-            'graph': ['cs.LG', 'cs.AI'],
-            'gnn': ['cs.LG'],
-            'rl': ['cs.LG', 'cs.AI'],
-            'reinforcement learning': ['cs.LG', 'cs.AI'],
-        }
+        The planner folds the categories into combined date-range queries,
+        which are fetched concurrently; papers are yielded as their pages are
+        parsed, merged by submission time with the stored papers of the window
+        when the local corpus is enabled, and the stream ends once max_results
+        have been yielded. When harvest tracking is on, the rest of the window
+        (or of the delta since the high-water mark) is still fetched and
+        stored in the background, so the next run only needs the delta.
+        Other fetches are abandoned when the stream ends or is closed.
+        
+        Args:
+            days_back: Number of days to look back (default: 7)
+            max_results: Maximum number of papers to yield
+            topic: Optional topic filter (NLP, LLM, CV, Graph, etc.)
+        
+        Yields:
+            Paper records
+        """
+        categories, keywords = self.planner.resolve_topic(topic)
         
-        # arXiv categories for AI/ML
-        if topic:
-            topic_lower = topic.lower()
-            categories = topic_map.get(topic_lower, ['cs.AI', 'cs.LG'])
-        else:
-            categories = [
-                'cs.AI',  # Artificial Intelligence
-                'cs.LG',  # Machine Learning
-                'cs.CL',  # Computation and Language (NLP)
-                'cs.CV',  # Computer Vision
-                'cs.NE',  # Neural and Evolutionary Computing
-                'stat.ML',  # Machine Learning (stats)
-            ]
-        
-        # Calculate date range
-        end_date = datetime.now()
+        # Calculate date range in naive UTC, like arXiv submission times
+        end_date = datetime.now(timezone.utc).replace(tzinfo=None)
         start_date = end_date - timedelta(days=days_back)
         
         logger.info(f"Fetching papers from {start_date.date()} to {end_date.date()}")
         
-        for category in categories:
-            try:
-                # Build search query
-                query = f"cat:{category}"
+        # Keyword topics only cover part of each category, so they read and
+        # write the local corpus but never move the category high-water marks
+        track_harvest = config.ARXIV_INCREMENTAL and not keywords
+        
+        seen_ids = set()
+        yielded = 0
+        db = get_db()
+        try:
+            # Answer straight from the local corpus when it was harvested recently
+            if config.ARXIV_INCREMENTAL:
+                try:
+                    fresh = db.arxiv_corpus_is_fresh(categories, start_date, config.ARXIV_CORPUS_MAX_AGE_MINUTES)
+                except Exception as e:
+                    logger.warning(f"Could not check local arXiv corpus: {e}")
+                    fresh = False
                 
-                # Create search
-                search = arxiv.Search(
-                    query=query,
-                    max_results=max_results // len(categories),
-                    sort_by=arxiv.SortCriterion.SubmittedDate,
-                    sort_order=arxiv.SortOrder.Descending
-                )
+                if fresh:
+                    served = 0
+                    for paper in db.iter_arxiv_papers(categories, start_date, limit=max_results, keywords=keywords):
+                        served += 1
+                        yield PaperRecord.from_dict(paper)
+                    logger.info(f"Served {served} papers from fresh local arXiv corpus")
+                    return
+            
+            # Only fetch what is newer than each category's high-water mark
+            fetch_since = {}
+            marks = {}
+            for category in categories:
+                mark = None
+                if track_harvest:
+                    try:
+                        mark = self._harvest_plan(db, category, start_date)
+                    except Exception as e:
+                        logger.warning(f"Could not read harvest state for {category}: {e}")
+                fetch_since[category] = max(mark, start_date) if mark else start_date
+                marks[category] = mark
+                if mark:
+                    logger.info(f"Category {category}: delta fetch since {mark}")
+            
+            # Stored papers for the window are read up front, before the
+            # harvest starts writing to the corpus
+            stored = []
+            if config.ARXIV_INCREMENTAL:
+                try:
+                    stored = list(db.iter_arxiv_papers(categories, start_date, limit=max_results, keywords=keywords))
+                except Exception as e:
+                    logger.warning(f"Could not read local arXiv corpus: {e}")
+            
+            # Combined OR-ed queries, one per distinct start date, run in parallel;
+            # each worker hands its papers over through its own queue as they arrive
+            plan = self.planner.plan(fetch_since, end_date, keywords)
+            per_query = None if track_harvest else max(1, max_results // len(plan))
+            workers = max(1, min(self.max_workers, len(plan)))
+            stop = threading.Event()
+            closed = threading.Event()
+            
+            logger.info(f"Planned {len(plan)} arXiv queries: {plan}")
+            
+            def fetch_worker(query: ArxivQuery, arrivals: queue.Queue):
+                def hand_over(paper: PaperRecord):
+                    if not closed.is_set():
+                        arrivals.put(paper)
                 
-                # Fetch results
-                for result in self.client.results(search):
-                    # Check if paper is within date range
-                    if result.published.replace(tzinfo=None) < start_date:
-                        continue
-                    
-                    paper = {
-                        'id': result.entry_id.split('/')[-1],
-                        'title': result.title,
-                        'authors': [author.name for author in result.authors],
-                        'abstract': result.summary,
-                        'published': result.published.strftime('%Y-%m-%d'),
-                        'updated': result.updated.strftime('%Y-%m-%d'),
-                        'categories': result.categories,
-                        'primary_category': result.primary_category,
-                        'pdf_url': result.pdf_url,
-                        'links': [link.href for link in result.links],
-                        'source': 'arxiv'
-                    }
-                    
-                    papers.append(paper)
-                    
-                logger.info(f"Fetched {len(papers)} papers from category {category}")
+                try:
+                    fetch = self._fetch_query(query, per_query, on_paper=hand_over, stop=stop)
+                except Exception as e:
+                    logger.error(f"Error fetching papers for categories {query.categories}: {e}")
+                    return
+                finally:
+                    arrivals.put(None)
+                self._store_fetch(query, fetch, track_harvest, fetch_since, marks)
+            
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='arxiv')
+            try:
+                streams = []
+                for query in plan:
+                    arrivals = queue.Queue()
+                    executor.submit(fetch_worker, query, arrivals)
+                    streams.append(iter(arrivals.get, None))
+                streams.append(PaperRecord.from_dict(paper) for paper in stored)
                 
-            except Exception as e:
-                logger.error(f"Error fetching papers from category {category}: {e}")
-                continue
-        
-        # Remove duplicates based on paper ID
-        unique_papers = {p['id']: p for p in papers}.values()
-        papers_list = list(unique_papers)
-        
-        logger.info(f"Total unique papers fetched: {len(papers_list)}")
-        return papers_list
+                # Every stream is newest first, so merging them yields the newest
+                # papers of the window in order; duplicates are removed based on
+                # the version-agnostic paper ID
+                for paper in heapq.merge(*streams, key=lambda paper: paper['submitted'], reverse=True):
+                    if paper.base_id in seen_ids:
+                        continue
+                    seen_ids.add(paper.base_id)
+                    yielded += 1
+                    yield paper
+                    if yielded >= max_results:
+                        break
+                logger.info(f"Yielded {yielded} papers ({len(stored)} candidates from local arXiv corpus)")
+            finally:
+                # A harvest keeps going in the background until its window is
+                # stored; other fetches are abandoned once nobody reads them
+                closed.set()
+                if not track_harvest:
+                    stop.set()
+                executor.shutdown(wait=False)
+        finally:
+            db.close()
     
-    def search_papers(self, query: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    def search_papers(self, query: str, max_results: int = 20) -> List[PaperRecord]:
         """
         Search for specific papers on arXiv
         
+        Repeated searches are served from a shared TTL cache; entries past
+        their TTL are served once more while being refreshed in background.
+        
         Args:
             query: Search query
             max_results: Maximum number of results
-            
+        
         Returns:
-            List of paper dictionaries
+            List of paper records
         """
-        papers = []
-        
         try:
-            search = arxiv.Search(
-                query=query,
-                max_results=max_results,
-                sort_by=arxiv.SortCriterion.Relevance
+            key = (_normalize_query(query), max_results)
+            papers = _search_cache.get_or_load(
+                key,
+                lambda: self._search_arxiv(query, max_results),
+                should_cache=bool
             )
             
-            for result in self.client.results(search):
-                paper = {
-                    'id': result.entry_id.split('/')[-1],
-                    'title': result.title,
-                    'authors': [author.name for author in result.authors],
-                    'abstract': result.summary,
-                    'published': result.published.strftime('%Y-%m-%d'),
-                    'categories': result.categories,
-                    'pdf_url': result.pdf_url,
-                    'source': 'arxiv'
-                }
-                papers.append(paper)
-            
             logger.info(f"Found {len(papers)} papers for query: {query}")
-            return papers
-            
+            # Callers decorate the returned records, keep cached copies pristine
+            return [paper.copy() for paper in papers]
+        
         except Exception as e:
             logger.error(f"Error searching arXiv: {e}")
             return []
-
+    
+    def _search_arxiv(self, query: str, max_results: int) -> List[PaperRecord]:
+        """Run a relevance-sorted search against the arXiv API"""
+        search = arxiv.Search(
+            query=query,
+            max_results=max_results,
+            sort_by=arxiv.SortCriterion.Relevance
+        )
+        return [self._result_to_paper(result) for result in self.client.results(search)]
+    
+    def get_search_cache_stats(self) -> Dict[str, Any]:
+        """Get search result cache statistics"""
+        return _search_cache.get_stats()
 
 def get_arxiv_tool() -> ArxivTool:
     """Get instance of ArxivTool"""
@@ -0,0 +1,124 @@
+"""
+Persistent conditional-GET cache for RSS feeds
+"""
+import json
+import time
+from typing import Dict, Any, List, Optional
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database.models import DatabaseManager, FeedCacheEntry
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FeedCache:
+    """Store of feed validators (ETag/Last-Modified) and parsed entries in the research database"""
+    
+    def __init__(self, db_path: str = None):
+        self.db = DatabaseManager(db_path)
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached validators and entries for a feed
+        
+        Returns:
+            Dictionary with etag, last_modified, source and entries, or None
+        """
+        with self.db.transaction() as session:
+            row = session.query(FeedCacheEntry).filter_by(url=url).first()
+            if row is None:
+                return None
+            
+            return {
+                'etag': row.etag,
+                'last_modified': row.last_modified,
+                'source': row.source,
+                'entries': json.loads(row.entries) if row.entries else []
+            }
+    
+    def conditional_headers(self, cached: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached feed"""
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+    
+    def record_hit(self, url: str, skipped: int = 0):
+        """Count a 304 Not Modified answer for a feed and the entries it spared"""
+        with self.db.transaction() as session:
+            session.query(FeedCacheEntry).filter_by(url=url).update({
+                FeedCacheEntry.hits: FeedCacheEntry.hits + 1,
+                FeedCacheEntry.skipped: FeedCacheEntry.skipped + skipped,
+                FeedCacheEntry.fetched_at: time.time()
+            }, synchronize_session=False)
+    
+    def set(self, url: str, etag: Optional[str], last_modified: Optional[str],
+            source: str, entries: List[Dict[str, Any]], skipped: int = 0):
+        """
+        Store a freshly downloaded feed, counting it as a miss
+        
+        Args:
+            url: Feed URL
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            source: Feed title
+            entries: Normalized entries in feed order, each with its guid
+            skipped: Already-seen entries that were not parsed again
+        """
+        stmt = sqlite_insert(FeedCacheEntry.__table__).values(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            source=source,
+            entries=json.dumps(entries),
+            fetched_at=time.time(),
+            hits=0,
+            misses=1,
+            skipped=skipped
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['url'],
+            set_={
+                'etag': stmt.excluded.etag,
+                'last_modified': stmt.excluded.last_modified,
+                'source': stmt.excluded.source,
+                'entries': stmt.excluded.entries,
+                'fetched_at': stmt.excluded.fetched_at,
+                'misses': FeedCacheEntry.misses + 1,
+                'skipped': FeedCacheEntry.skipped + stmt.excluded.skipped
+            }
+        )
+        with self.db.transaction() as session:
+            session.execute(stmt)
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-feed hit/miss and skipped-entry statistics"""
+        with self.db.transaction() as session:
+            rows = session.query(
+                FeedCacheEntry.url, FeedCacheEntry.hits, FeedCacheEntry.misses,
+                FeedCacheEntry.skipped, FeedCacheEntry.fetched_at
+            ).order_by(FeedCacheEntry.url).all()
+        
+        stats = {}
+        for url, hits, misses, skipped, fetched_at in rows:
+            lookups = hits + misses
+            stats[url] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': round(hits / lookups, 3) if lookups else 0.0,
+                'entries_skipped': skipped,
+                'last_fetched': fetched_at
+            }
+        return stats
+    
+    def clear(self):
+        """Remove all cached feeds"""
+        with self.db.transaction() as session:
+            session.query(FeedCacheEntry).delete()
+    
+    def close(self):
+        """Close cache database connection"""
+        self.db.close()
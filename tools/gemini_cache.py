@@ -0,0 +1,159 @@
+"""
+Persistent prompt/response cache for Gemini API calls
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class GeminiCache:
+    """SQLite-backed response cache with TTL expiry and LRU size eviction"""
+    
+    def __init__(self, db_path: str = None, ttl_seconds: int = None, max_entries: int = None):
+        if db_path is None:
+            db_path = config.GEMINI_CACHE_PATH
+        if ttl_seconds is None:
+            ttl_seconds = config.GEMINI_CACHE_TTL_HOURS * 3600
+        if max_entries is None:
+            max_entries = config.GEMINI_CACHE_MAX_ENTRIES
+        
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        # Ensure directory exists
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS gemini_cache (
+                cache_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_gemini_cache_accessed ON gemini_cache(last_accessed)"
+        )
+        self.conn.commit()
+    
+    @staticmethod
+    def make_key(model: str, prompt: str, generation_config: Dict[str, Any]) -> str:
+        """
+        Build cache key from model, prompt hash and generation config
+        
+        Args:
+            model: Gemini model name
+            prompt: The input prompt
+            generation_config: Gemini generationConfig dict
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        material = json.dumps(
+            {'model': model, 'prompt': prompt_hash, 'config': generation_config},
+            sort_keys=True
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get cached response, or None on miss/expiry"""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM gemini_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self.conn.execute("DELETE FROM gemini_cache WHERE cache_key = ?", (key,))
+                self.conn.commit()
+                self.misses += 1
+                return None
+            
+            self.conn.execute(
+                "UPDATE gemini_cache SET last_accessed = ? WHERE cache_key = ?",
+                (now, key)
+            )
+            self.conn.commit()
+            self.hits += 1
+            return response
+    
+    def set(self, key: str, response: str):
+        """Store response and evict least recently used entries over the size limit"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO gemini_cache (cache_key, response, created_at, last_accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._evict(now)
+            self.conn.commit()
+    
+    def delete(self, key: str):
+        """Remove one cached response"""
+        with self._lock:
+            self.conn.execute("DELETE FROM gemini_cache WHERE cache_key = ?", (key,))
+            self.conn.commit()
+    
+    def _evict(self, now: float):
+        """Drop expired entries, then LRU entries beyond max_entries (lock held)"""
+        self.conn.execute(
+            "DELETE FROM gemini_cache WHERE created_at < ?",
+            (now - self.ttl_seconds,)
+        )
+        count = self.conn.execute("SELECT COUNT(*) FROM gemini_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self.conn.execute(
+                "DELETE FROM gemini_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM gemini_cache ORDER BY last_accessed ASC LIMIT ?)",
+                (overflow,)
+            )
+            logger.info(f"Evicted {overflow} least recently used Gemini cache entries")
+    
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self.conn.execute("DELETE FROM gemini_cache")
+            self.conn.commit()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM gemini_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': entries,
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds
+            }
+    
+    def close(self):
+        """Close cache database connection"""
+        self.conn.close()
@@ -0,0 +1,149 @@
+"""
+In-process usage and latency metrics for Gemini API calls
+"""
+import threading
+import contextvars
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterable
+
+# Collector for the research run active in the current context, if any
+_current_run: contextvars.ContextVar = contextvars.ContextVar('gemini_run_metrics', default=None)
+
+
+class RunMetrics:
+    """Collects the Gemini calls made during one research run"""
+    
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._token = None
+    
+    def add(self, record: Dict[str, Any]):
+        """Add a call record to this run"""
+        with self._lock:
+            self.records.append(record)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate the calls recorded for this run"""
+        with self._lock:
+            records = list(self.records)
+        return summarize_records(records)
+
+
+class GeminiMetrics:
+    """Registry of recent Gemini calls with global and per-run aggregates"""
+    
+    def __init__(self, max_records: int = 1000):
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+    
+    def record(self, caller: str, outcome: str, latency: float, prompt_bytes: int,
+               response_bytes: int = 0, usage: Optional[Dict[str, Any]] = None):
+        """
+        Record a single Gemini call
+        
+        Args:
+            caller: Agent/method that issued the call
+            outcome: success, empty, error, cache_hit or collapsed
+            latency: Wall time in seconds
+            prompt_bytes: Size of the prompt in bytes
+            response_bytes: Size of the generated text in bytes
+            usage: usageMetadata from the Gemini response
+        """
+        usage = usage or {}
+        record = {
+            'caller': caller,
+            'outcome': outcome,
+            'latency': latency,
+            'prompt_bytes': prompt_bytes,
+            'response_bytes': response_bytes,
+            'prompt_tokens': usage.get('promptTokenCount', 0),
+            'output_tokens': usage.get('candidatesTokenCount', 0),
+            'total_tokens': usage.get('totalTokenCount', 0),
+        }
+        
+        with self._lock:
+            self.records.append(record)
+        
+        run = _current_run.get()
+        if run is not None:
+            run.add(record)
+    
+    def start_run(self) -> RunMetrics:
+        """Start collecting calls made in the current context into a new run"""
+        run = RunMetrics()
+        run._token = _current_run.set(run)
+        return run
+    
+    def end_run(self, run: RunMetrics) -> Dict[str, Any]:
+        """Stop collecting for a run and return its aggregates"""
+        if run._token is not None:
+            _current_run.reset(run._token)
+            run._token = None
+        return run.summary()
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Aggregate all recently recorded calls"""
+        with self._lock:
+            records = list(self.records)
+        return summarize_records(records)
+
+
+def summarize_records(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate call records by caller and outcome
+    
+    Returns:
+        Dictionary with totals plus a per-caller breakdown sorted by wall time
+    """
+    totals = {
+        'calls': 0,
+        'latency_seconds': 0.0,
+        'prompt_bytes': 0,
+        'response_bytes': 0,
+        'prompt_tokens': 0,
+        'output_tokens': 0,
+        'total_tokens': 0,
+    }
+    outcomes: Dict[str, int] = {}
+    by_caller: Dict[str, Dict[str, Any]] = {}
+    
+    for record in records:
+        caller_stats = by_caller.setdefault(record['caller'], {
+            'calls': 0,
+            'latency_seconds': 0.0,
+            'max_latency_seconds': 0.0,
+            'total_tokens': 0,
+        })
+        caller_stats['calls'] += 1
+        caller_stats['latency_seconds'] += record['latency']
+        caller_stats['max_latency_seconds'] = max(caller_stats['max_latency_seconds'], record['latency'])
+        caller_stats['total_tokens'] += record['total_tokens']
+        
+        totals['calls'] += 1
+        totals['latency_seconds'] += record['latency']
+        for field in ('prompt_bytes', 'response_bytes', 'prompt_tokens', 'output_tokens', 'total_tokens'):
+            totals[field] += record[field]
+        outcomes[record['outcome']] = outcomes.get(record['outcome'], 0) + 1
+    
+    totals['latency_seconds'] = round(totals['latency_seconds'], 3)
+    for caller_stats in by_caller.values():
+        caller_stats['latency_seconds'] = round(caller_stats['latency_seconds'], 3)
+        caller_stats['max_latency_seconds'] = round(caller_stats['max_latency_seconds'], 3)
+    
+    return {
+        **totals,
+        'outcomes': outcomes,
+        'by_caller': dict(sorted(by_caller.items(), key=lambda item: item[1]['latency_seconds'], reverse=True)),
+    }
+
+
+# Singleton instance
+_gemini_metrics = None
+
+def get_gemini_metrics() -> GeminiMetrics:
+    """Get singleton instance of GeminiMetrics"""
+    global _gemini_metrics
+    if _gemini_metrics is None:
+        _gemini_metrics = GeminiMetrics()
+    return _gemini_metrics
@@ -2,13 +2,78 @@
 Gemini API Tool for AI Research Bot
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from typing import Dict, Any, Optional
+import time
+import random
+import asyncio
+import threading
+import weakref
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple, Callable
+import sqlite3
 import config
+from tools.gemini_cache import GeminiCache
+from tools.rate_limiter import RateLimiter
+from tools.gemini_metrics import get_gemini_metrics
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Primary categories used when classifying papers
+PAPER_CATEGORIES = [
+    'LLM (Large Language Models)',
+    'Computer Vision',
+    'NLP (Natural Language Processing)',
+    'Reinforcement Learning',
+    'ML Theory',
+    'AI Safety',
+    'Robotics',
+    'Other',
+]
+
+# Response schema for rank_papers structured output
+RANKING_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "rank": {"type": "INTEGER"},
+            "paper_index": {"type": "INTEGER"},
+            "reason": {"type": "STRING"},
+        },
+        "required": ["rank", "paper_index", "reason"],
+    },
+}
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Limiter shared by every GeminiAPI instance in the process
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide Gemini rate limiter"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(
+                requests_per_minute=config.GEMINI_REQUESTS_PER_MINUTE,
+                tokens_per_minute=config.GEMINI_TOKENS_PER_MINUTE
+            )
+        return _rate_limiter
+
+
+class _InFlightCall:
+    """Result slot shared by callers waiting on the same Gemini request"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+
 
 class GeminiAPI:
     """Wrapper for Gemini API interactions"""
@@ -20,8 +85,70 @@ class GeminiAPI:
             'Content-Type': 'application/json',
             'X-goog-api-key': self.api_key
         }
+        self.timeout = (config.GEMINI_CONNECT_TIMEOUT, config.GEMINI_READ_TIMEOUT)
+        self.session = self._create_session()
+        self._stats_lock = threading.Lock()
+        self._request_count = 0
+        self.max_concurrency = config.GEMINI_MAX_CONCURRENCY
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self.cache = GeminiCache() if config.GEMINI_CACHE_ENABLED else None
+        self.rate_limiter = get_rate_limiter()
+        self.retry_count = 0
+        self._inflight: Dict[str, _InFlightCall] = {}
+        self._inflight_lock = threading.Lock()
+        self.collapsed_count = 0
+        self.metrics = get_gemini_metrics()
     
-    def generate_content(self, prompt: str, temperature: float = 0.7, max_tokens: Optional[int] = None) -> Optional[str]:
+    def _create_session(self) -> requests.Session:
+        """Create a pooled keep-alive session shared by all Gemini calls"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        
+        adapter = HTTPAdapter(
+            pool_connections=1,  # Single host: generativelanguage.googleapis.com
+            pool_maxsize=config.GEMINI_POOL_SIZE,
+            pool_block=False
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics
+        
+        Returns:
+            Dictionary with request count, opened connections and reuse ratio
+        """
+        connections_opened = 0
+        pools = self.session.get_adapter(self.api_url).poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+        
+        with self._stats_lock:
+            requests_sent = self._request_count
+        
+        reused = max(0, requests_sent - connections_opened)
+        return {
+            'requests': requests_sent,
+            'connections_opened': connections_opened,
+            'connections_reused': reused,
+            'reuse_ratio': round(reused / requests_sent, 3) if requests_sent else 0.0,
+            'pool_size': config.GEMINI_POOL_SIZE
+        }
+    
+    def close(self):
+        """Close the pooled HTTP session and response cache"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+    
+    def generate_content(self, prompt: str, temperature: float = 0.7, max_tokens: Optional[int] = None,
+                         use_cache: bool = True, caller: str = 'generate_content',
+                         response_schema: Optional[Dict[str, Any]] = None,
+                         validate: Optional[Callable[[str], bool]] = None) -> Optional[str]:
         """
         Generate content using Gemini API
         
@@ -29,6 +156,11 @@ class GeminiAPI:
             prompt: The input prompt
             temperature: Controls randomness (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
+            use_cache: Serve from / store into the persistent response cache
+            caller: Agent/method label recorded in the usage metrics
+            response_schema: Request structured JSON output matching this schema
+            validate: Check a response is usable; failing responses are never
+                cached, and a cached one that fails is dropped and requested again
             
         Returns:
             Generated text or None if error
@@ -51,17 +183,78 @@ class GeminiAPI:
         if max_tokens:
             payload["generationConfig"]["maxOutputTokens"] = max_tokens
         
+        if response_schema:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = response_schema
+        
+        start_time = time.perf_counter()
+        prompt_bytes = len(prompt.encode('utf-8'))
+        
+        request_key = GeminiCache.make_key(config.GEMINI_MODEL, prompt, payload["generationConfig"])
+        cache_key = request_key if use_cache and self.cache is not None else None
+        if cache_key:
+            cached = self._cache_get(cache_key)
+            if cached is not None and validate is not None and not validate(cached):
+                logger.warning(f"Dropping unusable cached Gemini response ({caller})")
+                self._cache_delete(cache_key)
+                cached = None
+            if cached is not None:
+                logger.info(f"Gemini cache hit for prompt length: {len(prompt)}")
+                self.metrics.record(caller, 'cache_hit', time.perf_counter() - start_time,
+                                    prompt_bytes, len(cached.encode('utf-8')))
+                return cached
+        
+        # Single-flight: identical concurrent prompts share one HTTP call
+        with self._inflight_lock:
+            call = self._inflight.get(request_key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._inflight[request_key] = call
+        
+        if not is_leader:
+            logger.info(f"Joining in-flight Gemini request for prompt length: {len(prompt)}")
+            call.done.wait()
+            with self._stats_lock:
+                self.collapsed_count += 1
+            self.metrics.record(caller, 'collapsed', time.perf_counter() - start_time, prompt_bytes,
+                                len(call.result.encode('utf-8')) if call.result else 0)
+            return call.result
+        
+        text = None
+        try:
+            text, usage, outcome = self._request_content(payload, prompt, max_tokens)
+            self.metrics.record(caller, outcome, time.perf_counter() - start_time, prompt_bytes,
+                                len(text.encode('utf-8')) if text else 0, usage)
+            if text is not None and cache_key:
+                if validate is None or validate(text):
+                    self._cache_set(cache_key, text)
+                else:
+                    logger.warning(f"Not caching unusable Gemini response ({caller})")
+            return text
+        finally:
+            call.result = text
+            with self._inflight_lock:
+                self._inflight.pop(request_key, None)
+            call.done.set()
+    
+    def _request_content(self, payload: Dict[str, Any], prompt: str,
+                         max_tokens: Optional[int]) -> Tuple[Optional[str], Dict[str, Any], str]:
+        """
+        Send one generateContent request and extract the response text
+        
+        Returns:
+            Tuple of (text or None, usageMetadata, outcome)
+        """
+        usage: Dict[str, Any] = {}
         try:
             logger.info(f"Calling Gemini API with prompt length: {len(prompt)}")
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                data=json.dumps(payload),
-                timeout=60
-            )
-            response.raise_for_status()
+            # Rough token estimate (~4 chars per token) for input plus requested output
+            estimated_tokens = len(prompt) // 4 + (max_tokens or 0)
+            response = self._post_with_retry(payload, estimated_tokens)
             
             result = response.json()
+            usage = result.get('usageMetadata', {})
             
             # Extract text from response
             if 'candidates' in result and len(result['candidates']) > 0:
@@ -69,34 +262,199 @@ class GeminiAPI:
                 if 'parts' in content and len(content['parts']) > 0:
                     text = content['parts'][0]['text']
                     logger.info(f"Successfully generated {len(text)} characters")
-                    return text
+                    return text, usage, 'success'
             
             logger.warning("No content generated from Gemini API")
-            return None
+            return None, usage, 'empty'
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Gemini API request failed: {e}")
-            return None
+            return None, usage, 'error'
         except (KeyError, IndexError, json.JSONDecodeError) as e:
             logger.error(f"Failed to parse Gemini API response: {e}")
+            return None, usage, 'error'
+    
+    def _post_with_retry(self, payload: Dict[str, Any], estimated_tokens: int) -> requests.Response:
+        """
+        POST to Gemini through the rate limiter, retrying transient failures
+        
+        Retries 429/5xx responses, timeouts and connection errors with
+        jittered exponential backoff, honoring Retry-After when present.
+        
+        Raises:
+            requests.exceptions.RequestException: When retries are exhausted
+        """
+        data = json.dumps(payload)
+        max_retries = config.GEMINI_MAX_RETRIES
+        
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire(estimated_tokens)
+            with self._stats_lock:
+                self._request_count += 1
+            
+            retry_after = None
+            try:
+                response = self.session.post(self.api_url, data=data, timeout=self.timeout)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == max_retries:
+                    response.raise_for_status()
+                    return response
+                retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+                reason = f"HTTP {response.status_code}"
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == max_retries:
+                    raise
+                reason = type(e).__name__
+            
+            delay = self._backoff_delay(attempt, retry_after)
+            with self._stats_lock:
+                self.retry_count += 1
+            logger.warning(f"Gemini API {reason}, retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
             return None
     
-    def summarize_text(self, text: str, max_sentences: int = 3) -> Optional[str]:
-        """Summarize text to specified number of sentences"""
-        prompt = f"""Summarize the following text in {max_sentences} sentences or less. 
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(config.GEMINI_BACKOFF_MAX, config.GEMINI_BACKOFF_BASE * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up cached response, treating cache errors as a miss"""
+        try:
+            return self.cache.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Gemini cache read failed: {e}")
+            return None
+    
+    def _cache_set(self, key: str, text: str):
+        """Store response in cache, ignoring cache errors"""
+        try:
+            self.cache.set(key, text)
+        except sqlite3.Error as e:
+            logger.warning(f"Gemini cache write failed: {e}")
+    
+    def _cache_delete(self, key: str):
+        """Remove a cached response, ignoring cache errors"""
+        try:
+            self.cache.delete(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Gemini cache delete failed: {e}")
+    
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """Get single-flight deduplication statistics"""
+        with self._inflight_lock:
+            in_flight = len(self._inflight)
+        with self._stats_lock:
+            collapsed = self.collapsed_count
+        return {'collapsed_calls': collapsed, 'in_flight': in_flight}
+    
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Get rate limiter and retry statistics"""
+        with self._stats_lock:
+            retries = self.retry_count
+        return {'retries': retries, **self.rate_limiter.get_stats()}
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics"""
+        if self.cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.cache.get_stats()}
+    
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        """Get the in-flight request semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_semaphores[loop] = semaphore
+        return semaphore
+    
+    async def generate_content_async(self, prompt: str, temperature: float = 0.7, max_tokens: Optional[int] = None,
+                                     use_cache: bool = True, caller: str = 'generate_content') -> Optional[str]:
+        """
+        Async counterpart of generate_content with bounded concurrency
+        
+        At most GEMINI_MAX_CONCURRENCY requests per event loop are in flight;
+        each one runs on the shared pooled session in a worker thread.
+        """
+        async with self._get_async_semaphore():
+            return await asyncio.to_thread(self.generate_content, prompt, temperature, max_tokens, use_cache, caller)
+    
+    def _summarize_prompt(self, text: str, max_sentences: int) -> str:
+        """Build summarization prompt"""
+        return f"""Summarize the following text in {max_sentences} sentences or less. 
 Be concise and focus on the main points:
 
 {text}
 
 Summary:"""
-        return self.generate_content(prompt, temperature=0.3)
     
-    def rank_papers(self, papers: list) -> Optional[str]:
+    def summarize_text(self, text: str, max_sentences: int = 3) -> Optional[str]:
+        """Summarize text to specified number of sentences"""
+        return self.generate_content(self._summarize_prompt(text, max_sentences), temperature=0.3,
+                                     caller='summarize_text')
+    
+    async def summarize_text_async(self, text: str, max_sentences: int = 3) -> Optional[str]:
+        """Async counterpart of summarize_text"""
+        return await self.generate_content_async(self._summarize_prompt(text, max_sentences), temperature=0.3,
+                                                 caller='summarize_text')
+    
+    def summarize_articles_batch(self, articles: list, max_sentences: int = 2,
+                                 validate: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Summarize several news articles and write an overview in one request
+        
+        Args:
+            articles: List of article dicts with title and summary (or fetched content)
+            max_sentences: Maximum sentences per article summary
+            validate: Caller's parse check; unparseable responses are not cached
+            
+        Returns:
+            JSON string with per-article summaries and an overall overview
+        """
+        articles_text = "\n\n".join([
+            f"Article {i+1}:\nTitle: {a.get('title', 'N/A')}\n{(a.get('content') or a.get('summary', ''))[:1500]}"
+            for i, a in enumerate(articles)
+        ])
+        
+        prompt = f"""You are an AI news editor. For each article below, write a concise summary in {max_sentences} sentences or less focusing on the main points.
+Then write a brief overview (2-3 sentences) of the main trends and topics across all articles.
+
+Articles:
+{articles_text}
+
+Return ONLY a JSON object in this format:
+{{"summaries": [{{"index": 1, "summary": "..."}}, ...], "overview": "..."}}
+Include one entry per article, using its 1-based index.
+
+JSON:"""
+        
+        return self.generate_content(prompt, temperature=0.3, caller='summarize_articles_batch', validate=validate)
+    
+    def rank_papers(self, papers: list, validate: Optional[Callable[[str], bool]] = None) -> Optional[str]:
         """
         Analyze and rank papers by importance
         
         Args:
             papers: List of paper dicts with title, abstract, authors, etc.
+            validate: Caller's parse check; unparseable responses are not cached
             
         Returns:
             JSON string with ranked papers
@@ -122,26 +480,61 @@ Format: [{{"rank": 1, "paper_index": X, "reason": "..."}}, ...]
 
 JSON:"""
         
-        return self.generate_content(prompt, temperature=0.5, max_tokens=2000)
+        schema = RANKING_SCHEMA if config.GEMINI_STRUCTURED_OUTPUT else None
+        return self.generate_content(prompt, temperature=0.5, max_tokens=2000, caller='rank_papers',
+                                     response_schema=schema, validate=validate)
     
-    def categorize_content(self, title: str, abstract: str) -> Optional[str]:
-        """Categorize paper into AI topics"""
-        prompt = f"""Categorize this AI paper into ONE primary category:
-- LLM (Large Language Models)
-- Computer Vision
-- NLP (Natural Language Processing)
-- Reinforcement Learning
-- ML Theory
-- AI Safety
-- Robotics
-- Other
+    def _categorize_prompt(self, title: str, abstract: str) -> str:
+        """Build categorization prompt"""
+        categories_text = "\n".join(f"- {c}" for c in PAPER_CATEGORIES)
+        return f"""Categorize this AI paper into ONE primary category:
+{categories_text}
 
 Title: {title}
 Abstract: {abstract[:300]}
 
 Return ONLY the category name, nothing else."""
+    
+    def categorize_content(self, title: str, abstract: str) -> Optional[str]:
+        """Categorize paper into AI topics"""
+        return self.generate_content(self._categorize_prompt(title, abstract), temperature=0.1,
+                                     caller='categorize_content')
+    
+    async def categorize_content_async(self, title: str, abstract: str) -> Optional[str]:
+        """Async counterpart of categorize_content"""
+        return await self.generate_content_async(self._categorize_prompt(title, abstract), temperature=0.1,
+                                                 caller='categorize_content')
+    
+    def categorize_papers_batch(self, papers: list,
+                                validate: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Categorize several papers in one request
+        
+        Args:
+            papers: List of paper dicts with id, title and abstract
+            validate: Caller's parse check; unparseable responses are not cached
+            
+        Returns:
+            JSON string mapping arXiv ID to category name
+        """
+        categories_text = "\n".join(f"- {c}" for c in PAPER_CATEGORIES)
+        papers_text = "\n\n".join([
+            f"ID: {p.get('id', i+1)}\nTitle: {p.get('title', 'N/A')}\nAbstract: {p.get('abstract', 'N/A')[:300]}"
+            for i, p in enumerate(papers)
+        ])
+        
+        prompt = f"""Categorize each of these AI papers into ONE primary category:
+{categories_text}
+
+Papers:
+{papers_text}
+
+Return ONLY a JSON object mapping each paper ID to its category name.
+Format: {{"<ID>": "<category>", ...}}
+
+JSON:"""
         
-        return self.generate_content(prompt, temperature=0.1)
+        return self.generate_content(prompt, temperature=0.1, caller='categorize_papers_batch', validate=validate)
     
     def generate_intro_message(self, date: str) -> Optional[str]:
         """Generate engaging introduction for daily digest"""
@@ -149,7 +542,7 @@ Return ONLY the category name, nothing else."""
 Make it enthusiastic and highlight the excitement of staying updated with AI developments.
 Keep it professional but friendly."""
         
-        return self.generate_content(prompt, temperature=0.8)
+        return self.generate_content(prompt, temperature=0.8, caller='generate_intro_message')
 
 
 # Singleton instance
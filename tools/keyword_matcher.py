@@ -0,0 +1,132 @@
+"""
+Precompiled multi-keyword matcher for filtering news articles
+"""
+import re
+from collections import Counter
+from typing import List, Dict, Iterable, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class KeywordMatcher:
+    """
+    Match any number of keywords against a text in a single regex scan
+    
+    All keywords are compiled into one case-insensitive regex shaped like a
+    trie, so each position costs one walk down shared prefixes however many
+    keywords there are. The regex sits in a lookahead so matches starting at
+    every position are found (e.g. both "machine learning" and "learning"). Keywords that are a
+    whole-word prefix of a longer match starting at the same position ("AI"
+    in "AI safety") are credited too, so hit counts are exact.
+    """
+    
+    def __init__(self, keywords: Iterable[str], whole_words: bool = True):
+        """
+        Args:
+            keywords: Keywords or phrases to look for (case-insensitive)
+            whole_words: Only match keywords that are not part of a longer word
+        """
+        # Deduplicate case-insensitively, keeping the first spelling
+        self.keywords: Dict[str, str] = {}
+        for keyword in keywords:
+            keyword = keyword.strip()
+            if keyword:
+                self.keywords.setdefault(keyword.lower(), keyword)
+        self.whole_words = whole_words
+        
+        lowered = sorted(self.keywords, key=len, reverse=True)
+        
+        # For every keyword, the keywords it implies when it matches
+        self._implied: Dict[str, Tuple[str, ...]] = {}
+        for long_kw in lowered:
+            self._implied[long_kw] = tuple(
+                self.keywords[short_kw] for short_kw in lowered
+                if long_kw.startswith(short_kw) and (
+                    short_kw == long_kw or not whole_words or not _is_word_char(long_kw[len(short_kw)])
+                )
+            )
+        
+        if not lowered:
+            self._pattern = None
+            return
+        
+        alternation = _trie_regex(lowered)
+        if whole_words:
+            alternation = rf'(?<!\w)(?:{alternation})(?!\w)'
+        self._pattern = re.compile(rf'(?=({alternation}))', re.IGNORECASE)
+    
+    def count(self, text: str) -> Counter:
+        """
+        Count keyword occurrences in a text
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Counter of keyword (as given) -> number of hits; empty if none match
+        """
+        hits = Counter()
+        if self._pattern is None or not text:
+            return hits
+        
+        for match in self._pattern.finditer(text):
+            implied = self._implied.get(match.group(1).lower())
+            if implied:
+                hits.update(implied)
+        return hits
+    
+    def matches(self, text: str) -> bool:
+        """Check whether any keyword occurs in a text"""
+        return self._pattern is not None and bool(text) and self._pattern.search(text) is not None
+    
+    def filter(self, articles: List[Dict], fields: Tuple[str, ...] = ('title', 'summary')) -> Tuple[List[Dict], Counter]:
+        """
+        Keep the articles that mention at least one keyword
+        
+        Each kept article gets a 'keyword_hits' dict of per-keyword counts.
+        
+        Args:
+            articles: Articles to filter
+            fields: Article fields to search
+        
+        Returns:
+            Tuple of (matching articles, total hits per keyword)
+        """
+        filtered = []
+        totals = Counter()
+        for article in articles:
+            hits = self.count(' '.join(article.get(field) or '' for field in fields))
+            if hits:
+                article['keyword_hits'] = dict(hits)
+                totals.update(hits)
+                filtered.append(article)
+        return filtered, totals
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the words, factored by common prefix
+    
+    Optional suffixes are greedy, so the longest word wins and shorter ones
+    are only tried if what follows rejects it.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if '' in node else body
+    
+    return build(trie)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
@@ -0,0 +1,134 @@
+"""
+Near-duplicate detection for news articles using MinHash
+"""
+import re
+import random
+import hashlib
+from typing import List, Dict, Any, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 16 bands x 4 rows: pairs above ~0.5 Jaccard similarity share a band
+NUM_PERMUTATIONS = 64
+BAND_ROWS = 4
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures are comparable across runs
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_WORD_RE = re.compile(r'\w+')
+
+# Feed boilerplate shared by every post of a feed (WordPress footers,
+# read-more links, truncation marks); kept out of the signature so posts
+# are compared on their own words
+_BOILERPLATE_RE = re.compile(
+    r'\bThe post\b.{0,300}?\bappeared first on\b.*$'
+    r'|\b(?:Continue reading|Keep reading|Read more|Read the full (?:story|article|post))'
+    r'(?:\s+(?:at|on)\s[^.]{0,80})?[\s.:\u2026\u00bb\u203a>-]*$'
+    r'|\[(?:\u2026|\.\.\.|&#8230;|&hellip;)\]',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def _token_hash(token: str) -> int:
+    """Stable 32-bit hash of a token (independent of PYTHONHASHSEED)"""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'big')
+
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """
+    MinHash signature of the set of words in a text
+    
+    The share of positions where two signatures agree estimates the
+    Jaccard similarity of the two word sets.
+    """
+    hashes = {_token_hash(word) for word in _WORD_RE.findall(text.lower())}
+    if not hashes:
+        return (_MAX_HASH,) * NUM_PERMUTATIONS
+    
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def strip_boilerplate(text: str) -> str:
+    """Remove feed boilerplate from an article snippet"""
+    return _BOILERPLATE_RE.sub(' ', text or '')
+
+
+def estimate_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def merge_near_duplicates(articles: List[Dict[str, Any]], threshold: float = 0.6) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Collapse articles telling the same story into one entry, in a single pass
+    
+    Signatures are split into bands and hashed into buckets, so each article
+    is only compared with earlier articles sharing a band. Only copies from
+    different sources are merged: posts of one feed often share template
+    wording, and a feed does not publish the same story twice. The first
+    article of each story is kept (callers pass them newest first) and gains
+    a 'sources' list with the distinct source links of its copies and a
+    'duplicates' count of the copies merged into it.
+    
+    Args:
+        articles: Articles with title, content_snippet, source and link
+        threshold: Minimum estimated Jaccard similarity of title + snippet words,
+            feed boilerplate excluded
+    
+    Returns:
+        Tuple of (unique articles, number of duplicates merged)
+    """
+    bands = NUM_PERMUTATIONS // BAND_ROWS
+    buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+    signatures: List[Tuple[int, ...]] = []
+    unique: List[Dict[str, Any]] = []
+    merged = 0
+    
+    for article in articles:
+        snippet = strip_boilerplate(article.get('content_snippet', ''))
+        signature = minhash_signature(f"{article.get('title', '')} {snippet}")
+        keys = [signature[band * BAND_ROWS:(band + 1) * BAND_ROWS] for band in range(bands)]
+        
+        match = None
+        checked = set()
+        for band, key in enumerate(keys):
+            for index in buckets[band].get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                if any(copy['source'] == article.get('source') for copy in unique[index]['sources']):
+                    continue
+                if estimate_similarity(signature, signatures[index]) >= threshold:
+                    match = index
+                    break
+            if match is not None:
+                break
+        
+        if match is not None:
+            story = unique[match]
+            if all(copy['link'] != article.get('link') for copy in story['sources']):
+                story['sources'].append({'source': article.get('source'), 'link': article.get('link')})
+            story['duplicates'] += 1
+            merged += 1
+            logger.debug(f"Merged near-duplicate '{article.get('title')}' into '{story.get('title')}'")
+            continue
+        
+        article['sources'] = [{'source': article.get('source'), 'link': article.get('link')}]
+        article['duplicates'] = 0
+        for band, key in enumerate(keys):
+            buckets[band].setdefault(key, []).append(len(unique))
+        signatures.append(signature)
+        unique.append(article)
+    
+    return unique, merged
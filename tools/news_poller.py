@@ -0,0 +1,212 @@
+"""
+Background news feed poller with adaptive per-feed intervals
+"""
+import os
+import time
+import uuid
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from statistics import median
+from typing import Dict, Any, List
+import config
+from tools.news_scraper import NewsScraper
+from tools.news_store import NewsStore, get_news_store
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Prune old entries at most this often
+_PRUNE_INTERVAL = 3600
+
+# Only the process holding the store's poller lease polls; it renews the
+# lease well before expiry, and a standby takes over once it lapses
+_LEASE_SECONDS = 300
+_LEASE_RENEW_SECONDS = 60
+
+
+class NewsPoller:
+    """
+    Daemon thread that keeps the news store filled between research runs
+    
+    Every feed has its own polling interval. The first poll guesses it from
+    the gaps between the feed's entry dates; afterwards it halves when a poll
+    finds new entries and grows by half when it finds none, so each feed
+    settles near its real publishing rate. Failed polls back off the same
+    way. Intervals stay between NEWS_POLL_MIN_MINUTES and NEWS_POLL_MAX_MINUTES.
+    
+    Every long-running process (scheduler, Discord bot, API) starts a poller,
+    but they share one store and only the holder of its lease polls, so
+    feeds are never fetched twice.
+    """
+    
+    def __init__(self, scraper: NewsScraper = None, store: NewsStore = None):
+        self.scraper = scraper or NewsScraper()
+        self.store = store or get_news_store()
+        self.min_interval = config.NEWS_POLL_MIN_MINUTES * 60
+        self.max_interval = config.NEWS_POLL_MAX_MINUTES * 60
+        self.name = "NewsPoller"
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_prune = 0.0
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._active = False
+    
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+    
+    def initial_interval(self, entries: List[Dict[str, Any]]) -> float:
+        """Guess a feed's polling interval from the median gap between its entries"""
+        dates = sorted(datetime.fromisoformat(entry['published']) for entry in entries if entry.get('published'))
+        gaps = [(later - earlier).total_seconds() for earlier, later in zip(dates, dates[1:])]
+        gaps = [gap for gap in gaps if gap > 0]
+        return self._clamp(median(gaps)) if gaps else self.min_interval
+    
+    def next_interval(self, interval: float, new_entries: int, success: bool = True) -> float:
+        """Adapt a feed's polling interval to the outcome of its last poll"""
+        if not success:
+            interval *= 2
+        elif new_entries:
+            interval /= 2
+        else:
+            interval *= 1.5
+        return self._clamp(interval)
+    
+    def poll_feed(self, url: str) -> int:
+        """
+        Poll one feed, store its new entries and schedule its next poll
+        
+        Returns:
+            Number of new entries
+        """
+        schedule = self.store.get_schedule(url)
+        try:
+            source, entries = self.scraper.load_feed_entries(url)
+        except Exception as e:
+            interval = self.next_interval(schedule['interval'] if schedule else self.min_interval, 0, success=False)
+            logger.warning(f"{self.name}: Polling {url} failed, retrying in {interval / 60:.0f} min: {e}")
+            self.store.record_poll(url, interval, 0, success=False)
+            return 0
+        
+        new_entries = self.store.add_entries(url, source, entries)
+        if schedule is None:
+            interval = self.initial_interval(entries)
+        else:
+            interval = self.next_interval(schedule['interval'], new_entries)
+        self.store.record_poll(url, interval, new_entries)
+        
+        logger.debug(f"{self.name}: {new_entries} new entries from {url}, next poll in {interval / 60:.0f} min")
+        return new_entries
+    
+    def poll_due(self) -> int:
+        """
+        Poll every feed whose interval has elapsed
+        
+        Returns:
+            Number of new entries stored
+        """
+        now = time.time()
+        due = []
+        for url in self.scraper.sources:
+            schedule = self.store.get_schedule(url)
+            if schedule is None or schedule['next_poll'] <= now:
+                due.append(url)
+        
+        if not due:
+            return 0
+        
+        workers = max(1, min(self.scraper.max_workers, len(due)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='news-poll') as executor:
+            new_entries = sum(executor.map(self.poll_feed, due))
+        
+        if new_entries:
+            logger.info(f"{self.name}: Polled {len(due)} feeds, stored {new_entries} new entries")
+        return new_entries
+    
+    def _seconds_until_next_poll(self) -> float:
+        """Time until the earliest feed is due"""
+        next_polls = [
+            schedule['next_poll']
+            for schedule in map(self.store.get_schedule, self.scraper.sources)
+            if schedule
+        ]
+        if len(next_polls) < len(self.scraper.sources):
+            return self.min_interval
+        return min(self.max_interval, max(1.0, min(next_polls) - time.time()))
+    
+    def _prune(self):
+        """Drop entries older than the retention period, at most hourly"""
+        if time.time() - self._last_prune < _PRUNE_INTERVAL:
+            return
+        self._last_prune = time.time()
+        removed = self.store.prune(config.NEWS_STORE_RETENTION_DAYS)
+        if removed:
+            logger.info(f"{self.name}: Pruned {removed} entries older than {config.NEWS_STORE_RETENTION_DAYS} days")
+    
+    def _hold_lease(self) -> bool:
+        """Take or renew the poller lease, logging when this process gains or loses it"""
+        try:
+            active = self.store.acquire_lease(self._owner, _LEASE_SECONDS)
+        except Exception as e:
+            logger.warning(f"{self.name}: Could not renew poller lease: {e}")
+            active = False
+        
+        if active != self._active:
+            state = "Polling feeds" if active else "Another process is polling, standing by"
+            logger.info(f"{self.name}: {state} ({self._owner})")
+            self._active = active
+        return active
+    
+    def _run(self):
+        while not self._stop.is_set():
+            delay = _LEASE_RENEW_SECONDS
+            try:
+                if self._hold_lease():
+                    self.poll_due()
+                    self._prune()
+                    delay = min(delay, self._seconds_until_next_poll())
+            except Exception as e:
+                logger.error(f"{self.name}: Polling pass failed: {e}", exc_info=True)
+            self._stop.wait(delay)
+        
+        if self._active:
+            self.store.release_lease(self._owner)
+            self._active = False
+    
+    def start(self):
+        """Start polling in the background (no-op if disabled or already running)"""
+        if not config.NEWS_POLLER_ENABLED:
+            logger.info(f"{self.name}: Disabled")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='news-poller', daemon=True)
+        self._thread.start()
+        logger.info(f"{self.name}: Started for {len(self.scraper.sources)} feeds")
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop polling, waiting up to timeout seconds for an in-flight pass"""
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info(f"{self.name}: Stopped")
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-feed polling statistics"""
+        return self.store.get_stats()
+
+
+# Singleton instance
+_news_poller = None
+
+def get_news_poller() -> NewsPoller:
+    """Get singleton instance of NewsPoller"""
+    global _news_poller
+    if _news_poller is None:
+        _news_poller = NewsPoller()
+    return _news_poller
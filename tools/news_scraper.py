@@ -1,16 +1,47 @@
 """
 News Scraper Tool for fetching AI news from various sources
 """
+import time
+import codecs
+import functools
+import threading
 import requests
 import feedparser
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
 import config
+from tools.feed_cache import FeedCache
+from tools.keyword_matcher import KeywordMatcher
+from tools.news_dedup import merge_near_duplicates
+from tools.news_store import get_news_store
+from tools.records import ArticleRecord
+from utils.html_text import html_to_text, HTMLTextStream
+from utils.ttl_cache import TTLCache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# A feed on the longest polling interval, plus slack for a slow poll
+_POLL_MAX_AGE = (config.NEWS_POLL_MAX_MINUTES + 5) * 60
+
+DEFAULT_NEWS_KEYWORDS = ('AI', 'artificial intelligence', 'machine learning', 'deep learning')
+
+
+@functools.lru_cache(maxsize=32)
+def _get_keyword_matcher(keywords: Tuple[str, ...], whole_words: bool) -> KeywordMatcher:
+    """Compile a keyword set once and reuse it across searches"""
+    return KeywordMatcher(keywords, whole_words=whole_words)
+
+
+# Extracted article text by (URL, max_chars), shared by all scrapers
+_article_cache = TTLCache(
+    ttl=config.NEWS_ARTICLE_CACHE_TTL_HOURS * 3600,
+    max_entries=config.NEWS_ARTICLE_CACHE_MAX_ENTRIES
+)
+
 
 class NewsScraper:
     """Tool for scraping AI news from RSS feeds and websites"""
@@ -20,15 +51,56 @@ class NewsScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.max_workers = config.NEWS_MAX_WORKERS
+        self.feed_timeout = config.NEWS_FEED_TIMEOUT
+        self.fetch_deadline = config.NEWS_FETCH_DEADLINE
+        self.session = self._create_session()
+        self.feed_cache = FeedCache() if config.NEWS_FEED_CACHE_ENABLED else None
+        self.news_store = get_news_store() if config.NEWS_POLLER_ENABLED else None
+        self.entries_skipped = 0
+        self._skipped_lock = threading.Lock()
+    
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session sized for concurrent feed downloads"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _download_feed(self, url: str, headers: Dict[str, str] = None) -> Tuple[requests.Response, bytes]:
+        """
+        Download a feed, giving up once it has taken longer than feed_timeout
+        
+        The requests timeout only bounds each socket read, so the body is read
+        in small chunks and the wall-clock deadline is checked between them.
+        
+        Returns:
+            Tuple of (response, body bytes)
+        """
+        deadline = time.monotonic() + self.feed_timeout
+        response = self.session.get(url, headers=headers, timeout=self.feed_timeout, stream=True)
+        try:
+            response.raise_for_status()
+            chunks = []
+            for chunk in response.iter_content(chunk_size=1024):
+                chunks.append(chunk)
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Feed download exceeded {self.feed_timeout:.0f}s")
+            return response, b''.join(chunks)
+        finally:
+            response.close()
     
-    def fetch_rss_feed(self, url: str, days_back: int = 1) -> List[Dict[str, Any]]:
+    def fetch_rss_feed(self, url: str, days_back: int = 1, new_only: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch articles from RSS feed
         
         Args:
             url: RSS feed URL
             days_back: Number of days to look back
-            
+            new_only: Only return entries not seen on earlier downloads
+        
         Returns:
             List of article dictionaries
         """
@@ -37,53 +109,187 @@ class NewsScraper:
         
         try:
             logger.info(f"Fetching RSS feed: {url}")
-            feed = feedparser.parse(url)
+            source, entries = self.load_feed_entries(url, new_only=new_only)
             
-            for entry in feed.entries:
-                # Parse published date
-                published = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published = datetime(*entry.updated_parsed[:6])
-                
+            for entry in entries:
                 # Filter by date
-                if published and published < cutoff_date:
+                if entry['published'] and datetime.fromisoformat(entry['published']) < cutoff_date:
                     continue
                 
-                article = {
-                    'title': entry.get('title', 'No title'),
-                    'link': entry.get('link', ''),
-                    'summary': entry.get('summary', ''),
-                    'published': published.strftime('%Y-%m-%d %H:%M') if published else 'Unknown',
-                    'source': feed.feed.get('title', url),
-                    'content_snippet': self._clean_html(entry.get('summary', ''))[:300]
-                }
-                
-                articles.append(article)
+                articles.append(self._build_article(entry, source))
             
             logger.info(f"Fetched {len(articles)} articles from {url}")
             return articles
-            
+        
         except Exception as e:
             logger.error(f"Error fetching RSS feed {url}: {e}")
             return []
     
+    def _build_article(self, entry: Dict[str, Any], source: str) -> ArticleRecord:
+        """Turn a normalized feed entry into an article record"""
+        published = datetime.fromisoformat(entry['published']) if entry['published'] else None
+        return ArticleRecord(
+            title=entry['title'],
+            link=entry['link'],
+            summary=entry['summary'],
+            published=published.strftime('%Y-%m-%d %H:%M') if published else 'Unknown',
+            source=source,
+            content_snippet=entry['content_snippet']
+        )
+    
+    def load_feed_entries(self, url: str, new_only: bool = False) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Get a feed's title and normalized entries, revalidating any cached copy
+        
+        With the feed cache enabled the request carries the stored ETag /
+        Last-Modified validators; a 304 Not Modified reuses the stored
+        entries without downloading or parsing the feed. When a feed has
+        changed, only entries whose GUID (or link) is not among the cached
+        ones are normalized; seen entries are taken from the cache wherever
+        they appear, so pinned items, unsorted feeds and backdated posts
+        cannot hide new entries. Skipped entries are added to entries_skipped.
+        
+        Args:
+            url: RSS feed URL
+            new_only: Return only entries not seen on earlier downloads
+        
+        Returns:
+            Tuple of (source title, entry dictionaries in feed order)
+        """
+        cached = self.feed_cache.get(url) if self.feed_cache else None
+        headers = self.feed_cache.conditional_headers(cached) if self.feed_cache else None
+        
+        response, content = self._download_feed(url, headers)
+        if response.status_code == 304 and cached:
+            logger.info(f"Feed not modified, reusing {len(cached['entries'])} cached entries: {url}")
+            self.feed_cache.record_hit(url, skipped=len(cached['entries']))
+            self._count_skipped(len(cached['entries']))
+            return cached['source'], [] if new_only else cached['entries']
+        
+        feed = feedparser.parse(
+            content,
+            response_headers={
+                'content-location': response.url,
+                'content-type': response.headers.get('Content-Type', '')
+            }
+        )
+        
+        seen = {entry['guid']: entry for entry in cached['entries'] if entry.get('guid')} if cached else {}
+        
+        entries = []
+        new_entries = []
+        for entry in feed.entries:
+            guid = entry.get('id') or entry.get('link', '')
+            if guid and guid in seen:
+                entries.append(seen[guid])
+                continue
+            
+            # Parse published date
+            published = None
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                published = datetime(*entry.published_parsed[:6])
+            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+                published = datetime(*entry.updated_parsed[:6])
+            
+            normalized = {
+                'guid': guid,
+                'title': entry.get('title', 'No title'),
+                'link': entry.get('link', ''),
+                'summary': entry.get('summary', ''),
+                'published': published.isoformat() if published else None,
+                'content_snippet': self._clean_html(entry.get('summary', ''))[:300]
+            }
+            entries.append(normalized)
+            new_entries.append(normalized)
+        
+        skipped = len(entries) - len(new_entries)
+        if skipped:
+            self._count_skipped(skipped)
+            logger.debug(f"Parsed {len(new_entries)} new entries, skipped {skipped} seen entries: {url}")
+        
+        source = feed.feed.get('title', url)
+        if self.feed_cache:
+            self.feed_cache.set(
+                url,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                source=source,
+                entries=entries,
+                skipped=skipped
+            )
+        return source, new_entries if new_only else entries
+    
+    def _count_skipped(self, count: int):
+        """Add to the already-seen entries skipped during this run"""
+        with self._skipped_lock:
+            self.entries_skipped += count
+    
+    def get_feed_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-source conditional GET hit statistics"""
+        return self.feed_cache.get_stats() if self.feed_cache else {}
+    
+    def get_stored_articles(self, feed_urls: List[str], days_back: int = 1) -> List[Dict[str, Any]]:
+        """
+        Get articles the background poller has collected for some feeds
+        
+        Args:
+            feed_urls: Feeds to read
+            days_back: Number of days to look back
+        
+        Returns:
+            List of article dictionaries
+        """
+        if not self.news_store:
+            return []
+        
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        return [
+            self._build_article(entry, entry['source'])
+            for entry in self.news_store.get_entries(feed_urls, cutoff_date)
+        ]
+    
     def fetch_all_sources(self, days_back: int = 1) -> List[Dict[str, Any]]:
         """
         Fetch articles from all configured sources
         
         Args:
             days_back: Number of days to look back
-            
+        
         Returns:
             Combined list of articles from all sources
         """
         all_articles = []
+        live_sources = self.sources
+        self.entries_skipped = 0
         
-        for source_url in self.sources:
-            articles = self.fetch_rss_feed(source_url, days_back)
-            all_articles.extend(articles)
+        # Feeds the background poller keeps up to date are read from its store
+        if self.news_store:
+            stored_sources = self.news_store.fresh_feeds(self.sources, _POLL_MAX_AGE)
+            if stored_sources:
+                all_articles.extend(self.get_stored_articles(stored_sources, days_back))
+                live_sources = [url for url in self.sources if url not in stored_sources]
+                logger.info(f"Read {len(all_articles)} precollected articles from {len(stored_sources)} feeds, "
+                            f"fetching {len(live_sources)} feeds live")
+        
+        # Download feeds in parallel; the stage takes as long as the slowest
+        # feed, bounded by fetch_deadline
+        workers = max(1, min(self.max_workers, len(live_sources)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='news')
+        try:
+            futures = [
+                executor.submit(self.fetch_rss_feed, source_url, days_back)
+                for source_url in live_sources
+            ]
+            wait(futures, timeout=self.fetch_deadline)
+            
+            for source_url, future in zip(live_sources, futures):
+                if future.done():
+                    all_articles.extend(future.result())
+                else:
+                    logger.warning(f"Skipping RSS feed {source_url}: no response within {self.fetch_deadline:.0f}s")
+        finally:
+            # Stragglers are abandoned; their own timeout ends them
+            executor.shutdown(wait=False, cancel_futures=True)
         
         # Sort by date (newest first)
         all_articles.sort(
@@ -91,79 +297,166 @@ class NewsScraper:
             reverse=True
         )
         
-        logger.info(f"Total articles fetched from all sources: {len(all_articles)}")
+        logger.info(f"Total articles fetched from all sources: {len(all_articles)} "
+                    f"({self.entries_skipped} already-seen feed entries skipped)")
+        
+        # Collapse the same story carried by several feeds (newest copy wins)
+        if config.NEWS_DEDUP_ENABLED:
+            all_articles, merged = merge_near_duplicates(all_articles, config.NEWS_DUPLICATE_THRESHOLD)
+            if merged:
+                logger.info(f"Merged {merged} near-duplicate articles, {len(all_articles)} unique stories")
         return all_articles[:config.MAX_NEWS_ARTICLES]
     
-    def search_ai_news(self, keywords: List[str] = None) -> List[Dict[str, Any]]:
+    def search_ai_news(self, keywords: List[str] = None, whole_words: bool = True) -> List[Dict[str, Any]]:
         """
         Search for AI news with specific keywords
         
+        All keywords are matched in one pass per article by a precompiled
+        KeywordMatcher; each returned article carries its 'keyword_hits'.
+        
         Args:
             keywords: List of keywords to filter by
-            
+            whole_words: Only match keywords as whole words ("AI" does not match "said")
+        
         Returns:
             Filtered list of articles
         """
         if keywords is None:
-            keywords = ['AI', 'artificial intelligence', 'machine learning', 'deep learning']
+            keywords = DEFAULT_NEWS_KEYWORDS
         
         all_articles = self.fetch_all_sources()
         
         # Filter by keywords
-        filtered_articles = []
-        for article in all_articles:
-            text_to_search = f"{article['title']} {article['summary']}".lower()
-            if any(keyword.lower() in text_to_search for keyword in keywords):
-                filtered_articles.append(article)
+        matcher = _get_keyword_matcher(tuple(keywords), whole_words)
+        filtered_articles, hits = matcher.filter(all_articles)
         
         logger.info(f"Filtered to {len(filtered_articles)} articles matching keywords")
+        if hits:
+            logger.debug(f"Keyword hits: {dict(hits.most_common(10))}")
         return filtered_articles
     
     def _clean_html(self, html_text: str) -> str:
         """Remove HTML tags from text"""
-        if not html_text:
-            return ""
-        
         try:
-            soup = BeautifulSoup(html_text, 'html.parser')
-            return soup.get_text(strip=True)
-        except:
-            return html_text
+            return html_to_text(html_text, strip=True)
+        except Exception:
+            return html_text or ""
     
-    def get_article_content(self, url: str) -> str:
+    def get_article_content(self, url: str, max_chars: int = None) -> str:
         """
-        Fetch full article content from URL (basic implementation)
+        Fetch full article content from URL
+        
+        The page is streamed and parsing stops as soon as max_chars of text
+        are available or NEWS_ARTICLE_MAX_BYTES have been read. Extracted
+        text is cached by URL.
         
         Args:
             url: Article URL
-            
+            max_chars: Maximum characters of text (default: NEWS_ARTICLE_MAX_CHARS)
+        
         Returns:
             Article text content
         """
+        max_chars = max_chars or config.NEWS_ARTICLE_MAX_CHARS
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(['script', 'style']):
-                script.decompose()
+            return _article_cache.get_or_load(
+                (url, max_chars),
+                lambda: self._fetch_article_text(url, max_chars),
+                should_cache=bool
+            )
+        
+        except Exception as e:
+            logger.error(f"Error fetching article content from {url}: {e}")
+            return ""
+    
+    def fetch_article_contents(self, urls: List[str], max_chars: int = None) -> Dict[str, str]:
+        """
+        Fetch several article bodies concurrently
+        
+        Args:
+            urls: Article URLs
+            max_chars: Maximum characters of text per article
+        
+        Returns:
+            Dictionary of URL -> article text for the pages that were fetched
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            return {}
+        
+        contents = {}
+        workers = max(1, min(self.max_workers, len(urls)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='article')
+        try:
+            futures = {url: executor.submit(self.get_article_content, url, max_chars) for url in urls}
+            wait(futures.values(), timeout=self.fetch_deadline)
             
-            # Get text
-            text = soup.get_text()
+            for url, future in futures.items():
+                if future.done() and future.result():
+                    contents[url] = future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        logger.info(f"Fetched article text for {len(contents)}/{len(urls)} articles")
+        return contents
+    
+    def _fetch_article_text(self, url: str, max_chars: int) -> str:
+        """Stream a page and extract at most max_chars of cleaned text"""
+        deadline = time.monotonic() + self.feed_timeout
+        response = self.session.get(url, timeout=self.feed_timeout, stream=True)
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and 'html' not in content_type and 'text' not in content_type:
+                logger.info(f"Skipping non-HTML article ({content_type}): {url}")
+                return ""
             
-            # Clean up
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            stream = HTMLTextStream()
+            decoder = None
+            bytes_read = 0
+            complete = True
+            for chunk in response.iter_content(chunk_size=16384):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(self._page_encoding(response, chunk))(errors='replace')
+                stream.feed(decoder.decode(chunk))
+                bytes_read += len(chunk)
+                
+                # Stop once the cleaned text is long enough
+                if stream.length >= max_chars and len(_clean_page_text(stream.text)) >= max_chars:
+                    complete = False
+                    break
+                if bytes_read >= config.NEWS_ARTICLE_MAX_BYTES or time.monotonic() > deadline:
+                    logger.info(f"Stopped reading article after {bytes_read} bytes: {url}")
+                    complete = False
+                    break
             
-            return text[:2000]  # Limit to 2000 chars
+            if complete:
+                if decoder is not None:
+                    stream.feed(decoder.decode(b'', final=True))
+                stream.close()
             
-        except Exception as e:
-            logger.error(f"Error fetching article content from {url}: {e}")
-            return ""
+            return _clean_page_text(stream.text)[:max_chars]
+        finally:
+            response.close()
+    
+    def _page_encoding(self, response: requests.Response, first_chunk: bytes) -> str:
+        """Pick the page encoding from the HTTP header, the markup, or UTF-8"""
+        encoding = None
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            encoding = response.encoding
+        if not encoding:
+            encoding = EncodingDetector.find_declared_encoding(first_chunk, is_html=True)
+        try:
+            return codecs.lookup(encoding).name if encoding else 'utf-8'
+        except LookupError:
+            return 'utf-8'
+
 
+def _clean_page_text(text: str) -> str:
+    """Collapse page text into single-spaced phrases"""
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
 
 def get_news_scraper() -> NewsScraper:
     """Get instance of NewsScraper"""
@@ -0,0 +1,227 @@
+"""
+Local store of news entries collected by the background feed poller
+"""
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Iterable, Optional
+from sqlalchemy import and_, or_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database.models import DatabaseManager, NewsEntry, FeedSchedule, PollerLease
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class NewsStore:
+    """Polled feed entries and each feed's polling schedule, kept in the research database"""
+    
+    def __init__(self, db_path: str = None):
+        self.db = DatabaseManager(db_path)
+    
+    def add_entries(self, feed_url: str, source: str, entries: List[Dict[str, Any]]) -> int:
+        """
+        Store a feed's entries, ignoring ones already collected
+        
+        Args:
+            feed_url: Feed the entries came from
+            source: Feed title
+            entries: Normalized entries (title, link, summary, published, content_snippet)
+        
+        Returns:
+            Number of entries that were new
+        """
+        if not entries:
+            return 0
+        
+        now = time.time()
+        rows = [
+            {
+                'feed_url': feed_url,
+                'link': entry.get('link') or entry.get('title', ''),
+                'source': source,
+                'title': entry.get('title'),
+                'summary': entry.get('summary'),
+                'published_date': datetime.fromisoformat(entry['published']) if entry.get('published') else None,
+                'content_snippet': entry.get('content_snippet'),
+                'first_seen': now
+            }
+            for entry in entries
+        ]
+        stmt = sqlite_insert(NewsEntry.__table__).on_conflict_do_nothing(index_elements=['feed_url', 'link'])
+        
+        with self.db.transaction() as session:
+            stored = session.query(func.count(NewsEntry.id)).filter(NewsEntry.feed_url == feed_url)
+            before = stored.scalar()
+            session.execute(stmt, rows)
+            return stored.scalar() - before
+    
+    def get_entries(self, feed_urls: Iterable[str], since: datetime) -> List[Dict[str, Any]]:
+        """
+        Get stored entries of some feeds published (or first seen, if undated) since a time
+        
+        Returns:
+            Entry dictionaries with source added
+        """
+        feed_urls = list(feed_urls)
+        if not feed_urls:
+            return []
+        
+        with self.db.transaction() as session:
+            rows = session.query(NewsEntry).filter(
+                NewsEntry.feed_url.in_(feed_urls),
+                or_(
+                    NewsEntry.published_date >= since,
+                    and_(NewsEntry.published_date.is_(None), NewsEntry.first_seen >= since.timestamp())
+                )
+            ).all()
+            return [row.to_dict() for row in rows]
+    
+    def get_schedule(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get a feed's polling state, or None if it has never been polled"""
+        with self.db.transaction() as session:
+            row = session.query(FeedSchedule).filter_by(url=url).first()
+            if row is None:
+                return None
+            
+            return {
+                'interval': row.interval,
+                'next_poll': row.next_poll,
+                'last_success': row.last_success,
+                'last_new_entry': row.last_new_entry
+            }
+    
+    def record_poll(self, url: str, interval: float, new_entries: int, success: bool = True):
+        """
+        Save the outcome of a poll and schedule the next one interval seconds from now
+        
+        Args:
+            url: Feed URL
+            interval: Seconds until the feed is due again
+            new_entries: Entries the poll added to the store
+            success: Whether the feed could be fetched
+        """
+        now = time.time()
+        stmt = sqlite_insert(FeedSchedule.__table__).values(
+            url=url,
+            interval=interval,
+            next_poll=now + interval,
+            last_success=now if success else None,
+            last_new_entry=now if new_entries else None,
+            polls=1,
+            new_entries=new_entries,
+            errors=0 if success else 1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['url'],
+            set_={
+                'interval': stmt.excluded.interval,
+                'next_poll': stmt.excluded.next_poll,
+                'last_success': func.coalesce(stmt.excluded.last_success, FeedSchedule.last_success),
+                'last_new_entry': func.coalesce(stmt.excluded.last_new_entry, FeedSchedule.last_new_entry),
+                'polls': FeedSchedule.polls + 1,
+                'new_entries': FeedSchedule.new_entries + stmt.excluded.new_entries,
+                'errors': FeedSchedule.errors + stmt.excluded.errors
+            }
+        )
+        with self.db.transaction() as session:
+            session.execute(stmt)
+    
+    def fresh_feeds(self, urls: Iterable[str], max_age: float) -> List[str]:
+        """
+        Get the feeds that were polled successfully within max_age seconds
+        
+        Only these can be served from the store; the rest need a live fetch.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        
+        with self.db.transaction() as session:
+            rows = session.query(FeedSchedule.url).filter(
+                FeedSchedule.url.in_(urls),
+                FeedSchedule.last_success >= time.time() - max_age
+            ).all()
+        
+        fresh = {url for (url,) in rows}
+        return [url for url in urls if url in fresh]
+    
+    def acquire_lease(self, owner: str, ttl: float, name: str = 'news_poller') -> bool:
+        """
+        Take or renew a cross-process lease
+        
+        The lease is granted if it is free, expired or already held by owner.
+        SQLite serializes the upsert, so processes sharing the database never
+        both hold it.
+        
+        Args:
+            owner: Unique ID of the requesting process
+            ttl: Seconds until the lease expires unless renewed
+            name: Lease name
+        
+        Returns:
+            True if owner now holds the lease
+        """
+        now = time.time()
+        stmt = sqlite_insert(PollerLease.__table__).values(name=name, owner=owner, expires_at=now + ttl)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['name'],
+            set_={'owner': stmt.excluded.owner, 'expires_at': stmt.excluded.expires_at},
+            where=or_(PollerLease.owner == stmt.excluded.owner, PollerLease.expires_at < now)
+        )
+        with self.db.transaction() as session:
+            session.execute(stmt)
+            holder = session.query(PollerLease.owner).filter_by(name=name).scalar()
+        return holder == owner
+    
+    def release_lease(self, owner: str, name: str = 'news_poller'):
+        """Give up a lease if owner holds it"""
+        with self.db.transaction() as session:
+            session.query(PollerLease).filter_by(name=name, owner=owner).delete()
+    
+    def prune(self, older_than_days: int) -> int:
+        """
+        Delete entries first seen more than older_than_days ago
+        
+        Returns:
+            Number of entries removed
+        """
+        with self.db.transaction() as session:
+            return session.query(NewsEntry).filter(
+                NewsEntry.first_seen < time.time() - older_than_days * 86400
+            ).delete(synchronize_session=False)
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-feed polling statistics"""
+        with self.db.transaction() as session:
+            schedules = session.query(FeedSchedule).order_by(FeedSchedule.url).all()
+            stored = dict(
+                session.query(NewsEntry.feed_url, func.count(NewsEntry.id)).group_by(NewsEntry.feed_url).all()
+            )
+            
+            return {
+                schedule.url: {
+                    'interval_minutes': round(schedule.interval / 60, 1),
+                    'next_poll': schedule.next_poll,
+                    'last_success': schedule.last_success,
+                    'polls': schedule.polls,
+                    'new_entries': schedule.new_entries,
+                    'errors': schedule.errors,
+                    'stored_entries': stored.get(schedule.url, 0)
+                }
+                for schedule in schedules
+            }
+    
+    def close(self):
+        """Close store database connection"""
+        self.db.close()
+
+
+# Singleton instance
+_news_store = None
+
+def get_news_store() -> NewsStore:
+    """Get singleton instance of NewsStore"""
+    global _news_store
+    if _news_store is None:
+        _news_store = NewsStore()
+    return _news_store
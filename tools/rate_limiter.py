@@ -0,0 +1,89 @@
+"""
+Client-side rate limiting for external APIs
+"""
+import time
+import threading
+from typing import Dict, Any
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # Tokens per second
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        """Add tokens accrued since last update (lock held)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket, going into debt if necessary
+        
+        Args:
+            amount: Number of tokens to take
+        
+        Returns:
+            Seconds the caller must wait before the reservation is honoured
+        """
+        # Never ask for more than a full bucket or the request could never run
+        amount = min(amount, self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter shared across callers"""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._stats_lock = threading.Lock()
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+    
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until one request carrying `tokens` tokens may be sent
+        
+        Args:
+            tokens: Estimated token cost of the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket is not None and tokens > 0:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        
+        if wait > 0:
+            logger.info(f"Rate limit reached, waiting {wait:.2f}s")
+            with self._stats_lock:
+                self.waits += 1
+                self.total_wait_seconds += wait
+            time.sleep(wait)
+        
+        return wait
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter wait statistics"""
+        with self._stats_lock:
+            return {
+                'waits': self.waits,
+                'total_wait_seconds': round(self.total_wait_seconds, 3)
+            }
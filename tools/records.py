@@ -0,0 +1,223 @@
+"""
+Compact record types for papers and news articles
+
+Records use __slots__ instead of a per-instance dict, intern the strings
+that repeat across a run (categories, dates, sources) and derive display
+fields on access. They behave as mutable mappings so agents keep using
+paper['title'] / paper.get('rank'); call to_dict() where data leaves the
+pipeline.
+"""
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from utils.helpers import split_arxiv_id
+
+_intern = sys.intern
+
+
+def format_authors(authors: Iterable[str]) -> str:
+    """Format author list for display"""
+    authors = list(authors or ())
+    if not authors:
+        return "Unknown"
+    
+    if len(authors) == 1:
+        return authors[0]
+    elif len(authors) == 2:
+        return f"{authors[0]} and {authors[1]}"
+    else:
+        return f"{authors[0]} et al."
+
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    """Intern a string that may be missing"""
+    return _intern(value) if isinstance(value, str) else value
+
+
+class _Record(MutableMapping):
+    """Slotted record with dict-style access to fields, derived fields and extras"""
+    
+    __slots__ = ('_extra',)
+    
+    # Stored attributes, in to_dict() order
+    FIELDS: tuple = ()
+    # Read-only fields computed from the stored ones on access
+    DERIVED: tuple = ()
+    
+    def __getitem__(self, key: str) -> Any:
+        # Explicitly assigned values (extras) take precedence over derived ones
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if key in self.FIELDS or key in self.DERIVED:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __delitem__(self, key: str):
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        for key in self.DERIVED:
+            if self._extra is None or key not in self._extra:
+                yield key
+        if self._extra:
+            yield from self._extra
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.get('id') or self.get('link')!r})"
+    
+    def copy(self) -> '_Record':
+        """Shallow copy sharing the immutable stored fields"""
+        clone = object.__new__(type(self))
+        for field in self.FIELDS:
+            setattr(clone, field, getattr(self, field))
+        clone._extra = dict(self._extra) if self._extra else None
+        return clone
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary for serialization at the API boundary"""
+        data = {}
+        for key in self:
+            value = self[key]
+            data[key] = list(value) if isinstance(value, tuple) else value
+        return data
+
+
+class PaperRecord(_Record):
+    """arXiv paper metadata"""
+    
+    __slots__ = ('id', 'title', 'authors', 'abstract', 'published', 'updated', 'submitted',
+                 'categories', 'primary_category', 'pdf_url', 'version', 'source', 'base_id', '_links')
+    
+    FIELDS = ('id', 'title', 'authors', 'abstract', 'published', 'updated', 'submitted',
+              'categories', 'primary_category', 'pdf_url', 'version', 'source')
+    DERIVED = ('base_id', 'links', 'authors_short', 'abstract_short')
+    
+    def __init__(self, id: str, title: str, authors: Iterable[str], abstract: str,
+                 published: str, updated: Optional[str] = None, categories: Iterable[str] = (),
+                 primary_category: Optional[str] = None, pdf_url: Optional[str] = None,
+                 links: Optional[Iterable[str]] = None, version: Optional[int] = None,
+                 source: str = 'arxiv', submitted: Optional[str] = None):
+        self.id = id
+        # Version-agnostic ID used for deduplication and the featured filter
+        self.base_id, id_version = split_arxiv_id(id)
+        self.title = title
+        self.authors = tuple(authors or ())
+        self.abstract = abstract or ''
+        self.published = _intern_optional(published)
+        self.updated = _intern_optional(updated)
+        # Full submission timestamp (naive UTC isoformat), orders papers within a day
+        self.submitted = submitted
+        self.categories = tuple(_intern(category) for category in categories or ())
+        self.primary_category = _intern_optional(primary_category)
+        self.pdf_url = pdf_url
+        self.version = version if version is not None else id_version
+        self.source = _intern_optional(source)
+        self._extra = None
+        
+        # Only keep links that cannot be rebuilt from the id and PDF URL
+        links = list(links) if links else None
+        self._links = None if links is None or links == self._default_links() else tuple(links)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PaperRecord':
+        """Build a record from a paper dictionary, keeping unknown keys as extras"""
+        if isinstance(data, PaperRecord):
+            return data
+        
+        record = cls(
+            id=data.get('id'),
+            title=data.get('title'),
+            authors=data.get('authors'),
+            abstract=data.get('abstract'),
+            published=data.get('published'),
+            updated=data.get('updated'),
+            categories=data.get('categories'),
+            primary_category=data.get('primary_category'),
+            pdf_url=data.get('pdf_url'),
+            links=data.get('links'),
+            version=data.get('version'),
+            source=data.get('source', 'arxiv'),
+            submitted=data.get('submitted')
+        )
+        for key, value in data.items():
+            if key not in cls.FIELDS and key not in cls.DERIVED:
+                record[key] = value
+        return record
+    
+    def copy(self) -> 'PaperRecord':
+        """Shallow copy sharing the immutable stored fields"""
+        clone = super().copy()
+        clone.base_id = self.base_id
+        clone._links = self._links
+        return clone
+    
+    def _default_links(self) -> List[str]:
+        """Abstract page and PDF links as returned by the arXiv API"""
+        links = [f"http://arxiv.org/abs/{self.id}"]
+        if self.pdf_url:
+            links.append(self.pdf_url)
+        return links
+    
+    @property
+    def links(self) -> List[str]:
+        """Paper links, rebuilt from the id unless non-standard"""
+        return list(self._links) if self._links is not None else self._default_links()
+    
+    @property
+    def authors_short(self) -> str:
+        """Short author line for display"""
+        return format_authors(self.authors)
+    
+    @property
+    def abstract_short(self) -> str:
+        """Truncated abstract for previews"""
+        return self.abstract[:300] + "..."
+
+
+class ArticleRecord(_Record):
+    """News article from an RSS feed"""
+    
+    __slots__ = ('title', 'link', 'summary', 'published', 'source', 'content_snippet')
+    
+    FIELDS = ('title', 'link', 'summary', 'published', 'source', 'content_snippet')
+    
+    def __init__(self, title: str, link: str, summary: str, published: str,
+                 source: str, content_snippet: str = ''):
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = _intern_optional(published)
+        self.source = _intern_optional(source)
+        self.content_snippet = content_snippet
+        self._extra = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ArticleRecord':
+        """Build a record from an article dictionary, keeping unknown keys as extras"""
+        if isinstance(data, ArticleRecord):
+            return data
+        
+        record = cls(**{field: data.get(field, '') for field in cls.FIELDS})
+        for key, value in data.items():
+            if key not in cls.FIELDS:
+                record[key] = value
+        return record
+
+
+def records_to_dicts(records: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Convert records (or plain dicts) to plain dictionaries"""
+    return [record.to_dict() if isinstance(record, _Record) else record for record in records]
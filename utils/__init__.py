@@ -2,6 +2,7 @@
 Utilities package
 """
 from .logger import get_logger, setup_logging
-from .helpers import create_directories, format_date, truncate_text
+from .helpers import create_directories, format_date, truncate_text, run_async, canonical_arxiv_id, split_arxiv_id
 
-__all__ = ['get_logger', 'setup_logging', 'create_directories', 'format_date', 'truncate_text']
+__all__ = ['get_logger', 'setup_logging', 'create_directories', 'format_date', 'truncate_text', 'run_async',
+           'canonical_arxiv_id', 'split_arxiv_id']
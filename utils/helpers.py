@@ -2,8 +2,16 @@
 Helper utilities for AI Research Bot
 """
 import os
+import re
+import json
+import asyncio
+import contextvars
+import concurrent.futures
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Any, Coroutine, List, Tuple
+
+# arXiv identifier, optionally as an abs/pdf URL, with optional version suffix
+_ARXIV_ID_RE = re.compile(r'^(?:https?://(?:export\.)?arxiv\.org/(?:abs|pdf)/)?(.+?)(?:v(\d+))?(?:\.pdf)?$')
 
 
 def create_directories():
@@ -99,3 +107,81 @@ def ensure_dir_exists(file_path: str):
     directory = os.path.dirname(file_path)
     if directory and not os.path.exists(directory):
         os.makedirs(directory)
+
+
+def split_arxiv_id(paper_id: str) -> Tuple[str, Optional[int]]:
+    """
+    Split an arXiv identifier into its version-agnostic base ID and version
+    
+    Args:
+        paper_id: ID such as '2401.01234v2', 'cs/0112017v1' or an arxiv.org URL
+        
+    Returns:
+        Tuple of (base ID, version or None when unversioned)
+    """
+    match = _ARXIV_ID_RE.match((paper_id or '').strip())
+    if not match:
+        return paper_id, None
+    base_id, version = match.groups()
+    return base_id, int(version) if version else None
+
+
+def canonical_arxiv_id(paper_id: str) -> str:
+    """Get the version-agnostic arXiv ID ('2401.01234v2' -> '2401.01234')"""
+    return split_arxiv_id(paper_id)[0]
+
+
+def run_async(coro: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code
+    
+    Works both from plain threads and from code that is already running
+    inside an event loop (e.g. the FastAPI scheduler), in which case the
+    coroutine is run on a fresh loop in a helper thread that inherits the
+    caller's context variables.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        Result of the coroutine
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        ctx = contextvars.copy_context()
+        return executor.submit(ctx.run, asyncio.run, coro).result()
+
+
+def recover_json_objects(text: str) -> List[dict]:
+    """
+    Recover every complete JSON object from possibly truncated or noisy text
+    
+    Useful when an LLM response is cut off mid-array: the objects that were
+    fully emitted are still returned instead of discarding the whole reply.
+    
+    Args:
+        text: Text containing JSON objects (e.g. a partial JSON array)
+        
+    Returns:
+        List of decoded objects, in order of appearance
+    """
+    decoder = json.JSONDecoder()
+    objects = []
+    pos = text.find('{')
+    
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            pos = text.find('{', pos + 1)
+            continue
+        
+        if isinstance(obj, dict):
+            objects.append(obj)
+        pos = text.find('{', end)
+    
+    return objects
@@ -0,0 +1,206 @@
+"""
+Lightweight HTML to text extraction
+"""
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import List
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Elements whose contents BeautifulSoup's get_text() leaves out
+_SKIPPED_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Elements inside which whitespace-only text is kept verbatim
+_PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+
+# Void elements never go on the open-element stack
+_VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer',
+])
+
+_ASCII_SPACES = ' \n\t\x0c\r'
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Whitespace-only runs become a single newline or space, as in BeautifulSoup"""
+    if text.strip(_ASCII_SPACES):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Streaming text collector matching BeautifulSoup(html, 'html.parser').get_text()
+    
+    No tree is built: text between two markup boundaries is accumulated as
+    one string (as BeautifulSoup would store it) and emitted immediately.
+    Only the names of open elements are tracked, so an end tag implicitly
+    closes unclosed children the way BeautifulSoup's tree builder does.
+    """
+    
+    def __init__(self, strip: bool):
+        super().__init__(convert_charrefs=False)
+        self.strip = strip
+        self.parts: List[str] = []
+        self._buffer: List[str] = []
+        self._open: List[str] = []
+        self._closed_void: List[str] = []
+        self._skip_depth = 0
+        self._preserve_depth = 0
+        self.length = 0
+    
+    def _flush(self):
+        """Emit the pending text node"""
+        if not self._buffer:
+            return
+        text = ''.join(self._buffer)
+        self._buffer.clear()
+        if self.strip:
+            text = text.strip()
+        elif not self._preserve_depth:
+            text = _collapse_whitespace(text)
+        if text:
+            self.parts.append(text)
+            self.length += len(text)
+    
+    def _add(self, text: str):
+        if not self._skip_depth:
+            self._buffer.append(text)
+    
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _VOID_TAGS:
+            # A stray end tag for this element will be ignored
+            self._closed_void.append(tag)
+            return
+        self._open.append(tag)
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _PRESERVE_WHITESPACE_TAGS:
+            self._preserve_depth += 1
+    
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+    
+    def handle_endtag(self, tag):
+        if tag in self._closed_void:
+            self._closed_void.remove(tag)
+            return
+        self._flush()
+        if tag not in self._open:
+            return
+        while True:
+            closed = self._open.pop()
+            if closed in _SKIPPED_TAGS:
+                self._skip_depth -= 1
+            elif closed in _PRESERVE_WHITESPACE_TAGS:
+                self._preserve_depth -= 1
+            if closed == tag:
+                break
+    
+    def handle_data(self, data):
+        self._add(data)
+    
+    def handle_entityref(self, name):
+        # Unknown entities are kept as written, minus the semicolon (as BeautifulSoup does)
+        self._add(html5.get(f"{name};", f"&{name}"))
+    
+    def handle_charref(self, name):
+        self._add(unescape(f"&#{name};"))
+    
+    def handle_comment(self, data):
+        self._flush()
+    
+    def handle_decl(self, decl):
+        self._flush()
+    
+    def handle_pi(self, data):
+        self._flush()
+    
+    def unknown_decl(self, data):
+        self._flush()
+        if data.startswith('CDATA['):
+            # CDATA sections are text even inside skipped elements
+            self._buffer.append(data[len('CDATA['):])
+            self._flush()
+    
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def html_to_text(html_text: str, strip: bool = False) -> str:
+    """
+    Extract the text of an HTML fragment or page
+    
+    Same output as BeautifulSoup(html_text, 'html.parser').get_text(strip=strip):
+    comments and the contents of script, style, template and ruby annotation
+    elements are dropped; with strip=True every text node is stripped and
+    empty ones are skipped. Falls back to BeautifulSoup if the streaming
+    parser rejects the input.
+    
+    Args:
+        html_text: HTML markup
+        strip: Strip whitespace from each text node
+    
+    Returns:
+        Extracted text
+    """
+    if not html_text:
+        return ""
+    
+    # Plain text needs no parsing
+    if '<' not in html_text and '&' not in html_text:
+        return html_text.strip() if strip else _collapse_whitespace(html_text)
+    
+    try:
+        extractor = _TextExtractor(strip)
+        extractor.feed(html_text)
+        extractor.close()
+        return ''.join(extractor.parts)
+    except Exception as e:
+        logger.debug(f"Streaming HTML extraction failed, using BeautifulSoup: {e}")
+        return _bs4_text(html_text, strip)
+
+
+class HTMLTextStream:
+    """
+    Incremental html_to_text for markup that arrives in chunks
+    
+    Text is available as soon as each node is complete, so a caller can stop
+    reading once it has enough.
+    """
+    
+    def __init__(self, strip: bool = False):
+        self._extractor = _TextExtractor(strip)
+    
+    def feed(self, markup: str):
+        """Parse the next chunk of markup"""
+        self._extractor.feed(markup)
+    
+    def close(self):
+        """Finish parsing once the whole document has been fed"""
+        self._extractor.close()
+    
+    @property
+    def length(self) -> int:
+        """Characters of text extracted so far"""
+        return self._extractor.length
+    
+    @property
+    def text(self) -> str:
+        """Text extracted so far"""
+        return ''.join(self._extractor.parts)
+
+
+def _bs4_text(html_text: str, strip: bool) -> str:
+    """Reference extraction with BeautifulSoup (fallback and benchmark baseline)"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_text, 'html.parser')
+    for element in soup(['script', 'style']):
+        element.decompose()
+    return soup.get_text(strip=strip)
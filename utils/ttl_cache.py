@@ -0,0 +1,109 @@
+"""
+In-memory TTL cache with stale-while-revalidate refresh
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a TTL
+    
+    Entries older than `ttl` but younger than `ttl + stale_ttl` are still
+    served immediately while a background thread refreshes them.
+    """
+    
+    def __init__(self, ttl: float, max_entries: int = 256, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, stored_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    should_cache: Callable[[Any], bool] = None) -> Any:
+        """
+        Get value for key, loading it (or refreshing it in background) as needed
+        
+        Args:
+            key: Cache key
+            loader: Function producing a fresh value
+            should_cache: Optional predicate; values failing it are not stored
+        
+        Returns:
+            Cached or freshly loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh, args=(key, loader, should_cache),
+                            name='ttl-cache-refresh', daemon=True
+                        ).start()
+                    return value
+                del self._entries[key]
+            self.misses += 1
+        
+        value = loader()
+        if should_cache is None or should_cache(value):
+            self.set(key, value)
+        return value
+    
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], should_cache: Optional[Callable[[Any], bool]]):
+        """Reload a stale entry in the background"""
+        try:
+            value = loader()
+            if should_cache is None or should_cache(value):
+                self.set(key, value)
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {key!r}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value, evicting least recently used entries over the size limit"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }